@@ -1,20 +1,15 @@
 """五子棋之人機對戰"""
 
 import sys
-import random
 import pygame
 from pygame.locals import *
 import pygame.gfxdraw
-from collections import namedtuple
 import time
-
-Chessman = namedtuple('Chessman', 'Name Value Color')
-Point = namedtuple('Point', 'X Y')
-
-BLACK_CHESSMAN = Chessman('黑子', 1, (45, 45, 45))
-WHITE_CHESSMAN = Chessman('白子', 2, (219, 219, 219))
-
-offset = [(1, 0), (0, 1), (1, 1), (1, -1)]
+from collections import deque
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, Checkerboard
+from engines import create_engine
+from worker import AIWorker
+from records import GameLog
 
 # 按鈕相關常數
 BUTTON_WIDTH = 120
@@ -24,6 +19,17 @@ BUTTON_COLOR = (70, 70, 70)
 BUTTON_HOVER_COLOR = (100, 100, 100)
 BUTTON_TEXT_COLOR = (255, 255, 255)
 
+# 電腦使用的 AI（見 engines.create_engine）：'search:easy' / 'search:normal' / 'search:hard' 為 alpha-beta 搜尋，
+# 難度即每步的搜尋預算；'mcts:<秒數>:<行程數>' 為蒙地卡羅樹搜尋；'greedy' 為只看一步的評分
+AI_ENGINE = 'search:normal'
+
+# 輪到玩家時讓電腦在背景預想玩家可能的應手
+AI_PONDER = True
+
+FPS = 30  # 電腦思考時主迴圈每秒最多輪詢/重繪次數，也讓出 CPU 給背景思考的執行緒
+IDLE_WAIT = 500  # 閒置時最多等待事件的毫秒數；畫面沒有變動時不重繪
+SHOW_FRAME_TIME = False  # 在面板顯示平均每幀的繪製時間
+
 # 遊戲記錄相關
 class GameRecord:
     def __init__(self):
@@ -32,22 +38,35 @@ class GameRecord:
         self.black_moves = 0
         self.white_moves = 0
         self.game_duration = 0
+        self.moves = []
         
 class GameStats:
-    def __init__(self):
+    """本次執行的對局與生涯統計；有 GameLog 時每局寫入記錄檔，生涯勝率直接取自其累計統計"""
+
+    def __init__(self, log=None):
         self.games = []
-        self.black_wins = 0
-        self.white_wins = 0
+        self.log = log
+        summary = log.summary if log is not None else {}
+        self.total_games = summary.get('games', 0)
+        self.black_wins = summary.get('black_wins', 0)
+        self.white_wins = summary.get('white_wins', 0)
         
     def add_game(self, record):
         self.games.append(record)
+        self.total_games += 1
         if record.winner == BLACK_CHESSMAN:
             self.black_wins += 1
         elif record.winner == WHITE_CHESSMAN:
             self.white_wins += 1
+        if self.log is not None:
+            winner = {BLACK_CHESSMAN: 'black', WHITE_CHESSMAN: 'white'}.get(record.winner)
+            try:
+                self.log.append(record.moves, winner, record.game_duration)
+            except OSError as e:
+                print(f'無法寫入對局記錄：{e}')
             
     def get_win_ratio(self):
-        total_games = len(self.games)
+        total_games = self.total_games
         if total_games == 0:
             return "尚無記錄"
         black_ratio = (self.black_wins / total_games) * 100
@@ -59,13 +78,22 @@ class Button:
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.is_hovered = False
+        self._surfaces = {}  # (字型, 是否懸停) -> 已畫好的按鈕
         
+    def render(self, font):
+        """回傳目前狀態的按鈕圖像，每種狀態只畫一次"""
+        key = (font, self.is_hovered)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(self.rect.size)
+            surface.fill(BUTTON_HOVER_COLOR if self.is_hovered else BUTTON_COLOR)
+            text_surface = font.render(self.text, True, BUTTON_TEXT_COLOR)
+            surface.blit(text_surface, text_surface.get_rect(center=surface.get_rect().center))
+            self._surfaces[key] = surface
+        return surface
+
     def draw(self, screen, font):
-        color = BUTTON_HOVER_COLOR if self.is_hovered else BUTTON_COLOR
-        pygame.draw.rect(screen, color, self.rect)
-        text_surface = font.render(self.text, True, BUTTON_TEXT_COLOR)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.render(font), self.rect)
         
     def handle_event(self, event):
         if event.type == MOUSEMOTION:
@@ -75,61 +103,6 @@ class Button:
                 return True
         return False
 
-class Checkerboard:
-    def __init__(self, line_points):
-        self._line_points = line_points
-        self._checkerboard = [[0] * line_points for _ in range(line_points)]
-
-    def _get_checkerboard(self):
-        return self._checkerboard
-
-    checkerboard = property(_get_checkerboard)
-
-    # 判断是否可落子
-    def can_drop(self, point):
-        return self._checkerboard[point.Y][point.X] == 0
-
-    def drop(self, chessman, point):
-        """
-        落子
-        :param chessman:
-        :param point:落子位置
-        :return:若该子落下之后即可获胜，则返回获胜方，否则返回 None
-        """
-        print(f'{chessman.Name} ({point.X}, {point.Y})')
-        self._checkerboard[point.Y][point.X] = chessman.Value
-
-        if self._win(point):
-            print(f'{chessman.Name}贏得勝利')
-            return chessman
-
-    # 判断是否赢了
-    def _win(self, point):
-        cur_value = self._checkerboard[point.Y][point.X]
-        for os in offset:
-            if self._get_count_on_direction(point, cur_value, os[0], os[1]):
-                return True
-
-    def _get_count_on_direction(self, point, value, x_offset, y_offset):
-        count = 1
-        for step in range(1, 5):
-            x = point.X + step * x_offset
-            y = point.Y + step * y_offset
-            if 0 <= x < self._line_points and 0 <= y < self._line_points and self._checkerboard[y][x] == value:
-                count += 1
-            else:
-                break
-        for step in range(1, 5):
-            x = point.X - step * x_offset
-            y = point.Y - step * y_offset
-            if 0 <= x < self._line_points and 0 <= y < self._line_points and self._checkerboard[y][x] == value:
-                count += 1
-            else:
-                break
-
-        return count >= 5
-
-
 SIZE = 30  # 棋盘每个点时间的间隔
 Line_Points = 19  # 棋盘每行/每列点数
 Outer_Width = 20  # 棋盘外宽度
@@ -151,6 +124,100 @@ BLUE_COLOR = (30, 30, 200)
 RIGHT_INFO_POS_X = SCREEN_HEIGHT + Stone_Radius2 * 2 + 10
 
 
+class BoardView:
+    """
+    只重繪有變動的區域：棋盤與格線預先畫在快取的背景上，棋子依落子記錄增量畫上，
+    文字與按鈕等圖層只在內容改變時更新，present() 只送出變動的矩形
+    """
+
+    def __init__(self, screen):
+        self._screen = screen
+        self._background = pygame.Surface(screen.get_size()).convert()
+        _draw_checkerboard(self._background)
+        self._board = self._background.copy()  # 背景加上棋子
+        self._checkerboard = None
+        self._drawn = 0      # 已畫上的落子數
+        self._items = {}     # 名稱 -> (surface, rect, 內容)，依加入順序疊在棋盤上
+        self._dirty = [screen.get_rect()]
+        self.frame_times = deque(maxlen=120)  # 最近幾幀的繪製秒數
+        self.frames = 0
+
+    @property
+    def dirty(self):
+        return bool(self._dirty)
+
+    @property
+    def frame_time(self):
+        """最近幾幀的平均繪製秒數"""
+        return sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
+
+    def sync(self, checkerboard):
+        """把 checkerboard 新增的落子畫上；換了棋盤或悔棋時從背景重畫"""
+        moves = checkerboard.moves
+        if checkerboard is not self._checkerboard or len(moves) < self._drawn:
+            self._checkerboard = checkerboard
+            self._board.blit(self._background, (0, 0))
+            self._drawn = 0
+            self._dirty.append(self._board.get_rect())
+        cells = checkerboard.checkerboard
+        for point in moves[self._drawn:]:
+            color = BLACK_CHESSMAN.Color if cells[point.Y][point.X] == BLACK_CHESSMAN.Value else WHITE_CHESSMAN.Color
+            _draw_chessman(self._board, point, color)
+            self._dirty.append(pygame.Rect(Start_X + SIZE * point.X - Stone_Radius - 1,
+                                           Start_Y + SIZE * point.Y - Stone_Radius - 1,
+                                           Stone_Radius * 2 + 3, Stone_Radius * 2 + 3))
+        self._drawn = len(moves)
+
+    def set_item(self, name, surface, pos, content=None):
+        """
+        放上或更新一個圖層；surface 與 content 都沒變時不重繪
+        :param content: 用來判斷內容是否改變的值，省略時以 surface 本身判斷
+        """
+        content = surface if content is None else content
+        old = self._items.get(name)
+        if old is not None and old[2] == content and old[1].topleft == tuple(pos):
+            return
+        rect = surface.get_rect(topleft=pos)
+        if old is not None:
+            self._dirty.append(old[1])
+        self._items[name] = (surface, rect, content)
+        self._dirty.append(rect)
+
+    def set_text(self, name, font, pos, text, color):
+        """文字圖層，只在文字或顏色改變時重新 render"""
+        old = self._items.get(name)
+        if old is not None and old[2] == (text, color) and old[1].topleft == tuple(pos):
+            return
+        self.set_item(name, font.render(text, True, color), pos, (text, color))
+
+    def remove(self, name):
+        old = self._items.pop(name, None)
+        if old is not None:
+            self._dirty.append(old[1])
+
+    def present(self):
+        """
+        重組變動的區域並送出到螢幕
+        :return: 是否有重繪
+        """
+        if not self._dirty:
+            return False
+        start = time.perf_counter()
+        screen = self._screen
+        for rect in self._dirty:
+            screen.set_clip(rect)
+            screen.blit(self._board, rect, rect)
+            for surface, item_rect, _ in self._items.values():
+                if item_rect.colliderect(rect):
+                    screen.blit(surface, item_rect)
+        screen.set_clip(None)
+        pygame.display.update(self._dirty)
+        self._dirty = []
+        self.frame_times.append(time.perf_counter() - start)
+        self.frames += 1
+        return True
+
+
 def print_text(screen, font, x, y, text, fcolor=(255, 255, 255)):
     imgText = font.render(text, True, fcolor)
     screen.blit(imgText, (x, y))
@@ -175,43 +242,59 @@ def main():
     checkerboard = Checkerboard(Line_Points)
     cur_runner = BLACK_CHESSMAN
     winner = None
-    computer = AI(Line_Points, WHITE_CHESSMAN)
+    # 電腦在背景執行緒思考，使用自己的棋盤，避免搜尋中暫放的棋子被畫出
+    computer = create_engine(AI_ENGINE, Line_Points, WHITE_CHESSMAN)
+    worker = AIWorker()
+    clock = pygame.time.Clock()
+    view = BoardView(screen)
 
-    game_stats = GameStats()
+    game_stats = GameStats(_open_log())
     current_game = GameRecord()
     start_time = time.time()
 
     while True:
-        for event in pygame.event.get():
+        if worker.thinking or view.dirty:
+            events = pygame.event.get()
+        else:
+            # 沒有事情要做時睡到下一個事件，不佔用 CPU
+            events = [pygame.event.wait(IDLE_WAIT)] + pygame.event.get()
+        for event in events:
             if event.type == QUIT:
-                sys.exit()
+                _quit(worker, view, computer)
             
             # 處理按鈕事件
             if restart_button.handle_event(event):
                 if winner is not None or current_game.total_moves > 0:
-                    current_game.game_duration = time.time() - start_time
-                    if winner:
-                        current_game.winner = winner
-                        game_stats.add_game(current_game)
+                    worker.cancel()
+                    worker.stop_pondering()
+                    # 已分勝負的對局在分出勝負時就記錄過了
                     winner = None
                     cur_runner = BLACK_CHESSMAN
                     checkerboard = Checkerboard(Line_Points)
-                    computer = AI(Line_Points, WHITE_CHESSMAN)
+                    _close_engine(computer)
+                    computer = create_engine(AI_ENGINE, Line_Points, WHITE_CHESSMAN)
                     current_game = GameRecord()
                     start_time = time.time()
                     
             elif surrender_button.handle_event(event):
                 if not winner and current_game.total_moves > 0:
+                    if worker.thinking:
+                        # 玩家在電腦思考時投降
+                        worker.cancel()
+                        cur_runner = BLACK_CHESSMAN
+                    # 玩家在自己的回合投降時，電腦可能正在預想
+                    worker.stop_pondering()
                     winner = WHITE_CHESSMAN if cur_runner == BLACK_CHESSMAN else BLACK_CHESSMAN
                     current_game.game_duration = time.time() - start_time
                     current_game.winner = winner
+                    current_game.moves = list(checkerboard.moves)
                     game_stats.add_game(current_game)
                     
             elif quit_button.handle_event(event):
-                sys.exit()
+                _quit(worker, view, computer)
                 
             elif event.type == MOUSEBUTTONDOWN:
-                if winner is None:
+                if winner is None and not worker.thinking:
                     pressed_array = pygame.mouse.get_pressed()
                     if pressed_array[0]:
                         mouse_pos = pygame.mouse.get_pos()
@@ -227,52 +310,93 @@ def main():
                                     
                                 if winner is None:
                                     cur_runner = _get_next(cur_runner)
-                                    computer.get_opponent_drop(click_point)
-                                    AI_point = computer.AI_drop()
-                                    winner = checkerboard.drop(cur_runner, AI_point)
-                                    current_game.total_moves += 1
-                                    current_game.white_moves += 1
-                                    
-                                    if winner is not None:
-                                        current_game.winner = winner
-                                        current_game.game_duration = time.time() - start_time
-                                        game_stats.add_game(current_game)
-                                    cur_runner = _get_next(cur_runner)
+                                    worker.request(computer, click_point)
                                 else:
                                     current_game.winner = winner
                                     current_game.game_duration = time.time() - start_time
+                                    current_game.moves = list(checkerboard.moves)
                                     game_stats.add_game(current_game)
                         else:
                             print('超出棋盤區域')
 
-        # 畫棋盤
-        _draw_checkerboard(screen)
-
-        # 畫棋盤上已有的棋子
-        for i, row in enumerate(checkerboard.checkerboard):
-            for j, cell in enumerate(row):
-                if cell == BLACK_CHESSMAN.Value:
-                    _draw_chessman(screen, Point(j, i), BLACK_CHESSMAN.Color)
-                elif cell == WHITE_CHESSMAN.Value:
-                    _draw_chessman(screen, Point(j, i), WHITE_CHESSMAN.Color)
+        # 電腦思考完成
+        AI_point = worker.poll()
+        if AI_point is not None:
+            winner = checkerboard.drop(cur_runner, AI_point)
+            current_game.total_moves += 1
+            current_game.white_moves += 1
+
+            if winner is not None:
+                current_game.winner = winner
+                current_game.game_duration = time.time() - start_time
+                current_game.moves = list(checkerboard.moves)
+                game_stats.add_game(current_game)
+            elif AI_PONDER:
+                worker.ponder(computer)
+            cur_runner = _get_next(cur_runner)
+
+        # 畫棋盤上新增的棋子
+        view.sync(checkerboard)
 
         # 畫按鈕
-        restart_button.draw(screen, font3)
-        surrender_button.draw(screen, font3)
-        quit_button.draw(screen, font3)
+        for name, button in (('restart', restart_button), ('surrender', surrender_button), ('quit', quit_button)):
+            view.set_item(name, button.render(font3), button.rect.topleft)
 
         # 顯示遊戲統計信息
         stats_y = 50
-        print_text(screen, font3, SCREEN_HEIGHT + 20, stats_y, f"本局步數: {current_game.total_moves}", BLUE_COLOR)
-        print_text(screen, font3, SCREEN_HEIGHT + 20, stats_y + 30, f"黑子步數: {current_game.black_moves}", BLUE_COLOR)
-        print_text(screen, font3, SCREEN_HEIGHT + 20, stats_y + 60, f"白子步數: {current_game.white_moves}", BLUE_COLOR)
-        print_text(screen, font3, SCREEN_HEIGHT + 20, stats_y + 90, f"總局數: {len(game_stats.games)}", BLUE_COLOR)
-        print_text(screen, font3, SCREEN_HEIGHT + 20, stats_y + 120, f"勝率: {game_stats.get_win_ratio()}", BLUE_COLOR)
+        x = SCREEN_HEIGHT + 20
+        view.set_text('total_moves', font3, (x, stats_y), f"本局步數: {current_game.total_moves}", BLUE_COLOR)
+        view.set_text('black_moves', font3, (x, stats_y + 30), f"黑子步數: {current_game.black_moves}", BLUE_COLOR)
+        view.set_text('white_moves', font3, (x, stats_y + 60), f"白子步數: {current_game.white_moves}", BLUE_COLOR)
+        view.set_text('games', font3, (x, stats_y + 90), f"總局數: {game_stats.total_games}", BLUE_COLOR)
+        view.set_text('win_ratio', font3, (x, stats_y + 120), f"勝率: {game_stats.get_win_ratio()}", BLUE_COLOR)
+        ponder_hits = getattr(computer, 'ponder_hits', 0)
+        ponders = ponder_hits + getattr(computer, 'ponder_misses', 0)
+        if AI_PONDER and ponders:
+            view.set_text('ponder', font3, (x, stats_y + 180), f"預想命中: {ponder_hits}/{ponders}", BLUE_COLOR)
+        else:
+            view.remove('ponder')
+        if worker.thinking:
+            dots = '.' * (int(worker.elapsed * 2) % 4)
+            view.set_text('thinking', font3, (x, stats_y + 150), f"電腦思考中{dots}", RED_COLOR)
+        else:
+            view.remove('thinking')
+        if SHOW_FRAME_TIME and view.dirty:
+            # 只隨其他變動一起更新，避免自己不停觸發重繪
+            view.set_text('frame_time', font3, (x, stats_y + 210), f"每幀: {view.frame_time * 1000:.2f} ms", BLUE_COLOR)
 
         if winner:
-            print_text(screen, font2, (SCREEN_WIDTH - fwidth)//2, (SCREEN_HEIGHT - fheight)//2, winner.Name + '獲勝', RED_COLOR)
+            view.set_text('winner', font2, ((SCREEN_WIDTH - fwidth)//2, (SCREEN_HEIGHT - fheight)//2),
+                          winner.Name + '獲勝', RED_COLOR)
+        else:
+            view.remove('winner')
+
+        view.present()
+        if worker.thinking:
+            clock.tick(FPS)
+
+
+def _open_log():
+    try:
+        return GameLog()
+    except OSError as e:
+        print(f'無法讀取對局記錄，本次不保存：{e}')
+        return None
+
+
+def _close_engine(engine):
+    # 使用行程池的 AI（如 mcts）需要結束其行程
+    close = getattr(engine, 'close', None)
+    if close is not None:
+        close()
 
-        pygame.display.flip()
+
+def _quit(worker, view, engine):
+    worker.shutdown()
+    _close_engine(engine)
+    if view.frames:
+        print(f'共繪製 {view.frames} 幀，最近平均每幀 {view.frame_time * 1000:.2f} ms')
+    sys.exit()
 
 
 def _get_next(cur_runner):
@@ -356,193 +480,5 @@ def _get_clickpoint(click_pos):
     return Point(x, y)
 
 
-class AI:
-    def __init__(self, line_points, chessman):
-        self._line_points = line_points
-        self._my = chessman
-        self._opponent = BLACK_CHESSMAN if chessman == WHITE_CHESSMAN else WHITE_CHESSMAN
-        self._checkerboard = [[0] * line_points for _ in range(line_points)]
-
-    def get_opponent_drop(self, point):
-        self._checkerboard[point.Y][point.X] = self._opponent.Value
-
-    def AI_drop(self):
-        point = None
-        score = 0
-        for i in range(self._line_points):
-            for j in range(self._line_points):
-                if self._checkerboard[j][i] == 0:
-                    _score = self._get_point_score(Point(i, j))
-                    if _score > score:
-                        score = _score
-                        point = Point(i, j)
-                    elif _score == score and _score > 0:
-                        r = random.randint(0, 100)
-                        if r % 2 == 0:
-                            point = Point(i, j)
-        self._checkerboard[point.Y][point.X] = self._my.Value
-        return point
-
-    def _get_point_score(self, point):
-        score = 0
-        for os in offset:
-            score += self._get_direction_score(point, os[0], os[1])
-        return score
-
-    def _get_direction_score(self, point, x_offset, y_offset):
-        count = 0   # 落子处我方连续子数
-        _count = 0  # 落子处对方连续子数
-        space = None   # 我方连续子中有无空格
-        _space = None  # 对方连续子中有无空格
-        both = 0    # 我方连续子两端有无阻挡
-        _both = 0   # 对方连续子两端有无阻挡
-
-        # 如果是 1 表示是边上是我方子，2 表示敌方子
-        flag = self._get_stone_color(point, x_offset, y_offset, True)
-        if flag != 0:
-            for step in range(1, 6):
-                x = point.X + step * x_offset
-                y = point.Y + step * y_offset
-                if 0 <= x < self._line_points and 0 <= y < self._line_points:
-                    if flag == 1:
-                        if self._checkerboard[y][x] == self._my.Value:
-                            count += 1
-                            if space is False:
-                                space = True
-                        elif self._checkerboard[y][x] == self._opponent.Value:
-                            _both += 1
-                            break
-                        else:
-                            if space is None:
-                                space = False
-                            else:
-                                break   # 遇到第二个空格退出
-                    elif flag == 2:
-                        if self._checkerboard[y][x] == self._my.Value:
-                            _both += 1
-                            break
-                        elif self._checkerboard[y][x] == self._opponent.Value:
-                            _count += 1
-                            if _space is False:
-                                _space = True
-                        else:
-                            if _space is None:
-                                _space = False
-                            else:
-                                break
-                else:
-                    # 遇到边也就是阻挡
-                    if flag == 1:
-                        both += 1
-                    elif flag == 2:
-                        _both += 1
-
-        if space is False:
-            space = None
-        if _space is False:
-            _space = None
-
-        _flag = self._get_stone_color(point, -x_offset, -y_offset, True)
-        if _flag != 0:
-            for step in range(1, 6):
-                x = point.X - step * x_offset
-                y = point.Y - step * y_offset
-                if 0 <= x < self._line_points and 0 <= y < self._line_points:
-                    if _flag == 1:
-                        if self._checkerboard[y][x] == self._my.Value:
-                            count += 1
-                            if space is False:
-                                space = True
-                        elif self._checkerboard[y][x] == self._opponent.Value:
-                            _both += 1
-                            break
-                        else:
-                            if space is None:
-                                space = False
-                            else:
-                                break   # 遇到第二个空格退出
-                    elif _flag == 2:
-                        if self._checkerboard[y][x] == self._my.Value:
-                            _both += 1
-                            break
-                        elif self._checkerboard[y][x] == self._opponent.Value:
-                            _count += 1
-                            if _space is False:
-                                _space = True
-                        else:
-                            if _space is None:
-                                _space = False
-                            else:
-                                break
-                else:
-                    # 遇到边也就是阻挡
-                    if _flag == 1:
-                        both += 1
-                    elif _flag == 2:
-                        _both += 1
-
-        score = 0
-        if count == 4:
-            score = 10000
-        elif _count == 4:
-            score = 9000
-        elif count == 3:
-            if both == 0:
-                score = 1000
-            elif both == 1:
-                score = 100
-            else:
-                score = 0
-        elif _count == 3:
-            if _both == 0:
-                score = 900
-            elif _both == 1:
-                score = 90
-            else:
-                score = 0
-        elif count == 2:
-            if both == 0:
-                score = 100
-            elif both == 1:
-                score = 10
-            else:
-                score = 0
-        elif _count == 2:
-            if _both == 0:
-                score = 90
-            elif _both == 1:
-                score = 9
-            else:
-                score = 0
-        elif count == 1:
-            score = 10
-        elif _count == 1:
-            score = 9
-        else:
-            score = 0
-
-        if space or _space:
-            score /= 2
-
-        return score
-
-    # 判断指定位置处在指定方向上是我方子、对方子、空
-    def _get_stone_color(self, point, x_offset, y_offset, next):
-        x = point.X + x_offset
-        y = point.Y + y_offset
-        if 0 <= x < self._line_points and 0 <= y < self._line_points:
-            if self._checkerboard[y][x] == self._my.Value:
-                return 1
-            elif self._checkerboard[y][x] == self._opponent.Value:
-                return 2
-            else:
-                if next:
-                    return self._get_stone_color(Point(x, y), x_offset, y_offset, False)
-                else:
-                    return 0
-        else:
-            return 0
-
-
 if __name__ == '__main__':
     main()
@@ -0,0 +1,304 @@
+"""五子棋 AI：依棋型為每個空點評分，取最高分落子"""
+
+import random
+from functools import lru_cache
+import numpy as np
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, offset, BitBoard, Checkerboard
+import patterns
+import threatmap
+
+SCORE_RADIUS = 5  # 評分時每個方向最多往外看 5 格，落子只影響這個範圍內的點
+
+
+@lru_cache(maxsize=None)
+def _affected_points(line_points):
+    """
+    在 (x, y) 落子或移除後需要重新評分的點：四條線上距離 SCORE_RADIUS 內
+    :return: affected[y][x] = ((x, y), ...)
+    """
+    n = line_points
+    affected = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            points = [(x, y)]
+            for x_offset, y_offset in offset:
+                for step in range(1, SCORE_RADIUS + 1):
+                    for sign in (1, -1):
+                        _x = x + sign * step * x_offset
+                        _y = y + sign * step * y_offset
+                        if 0 <= _x < n and 0 <= _y < n:
+                            points.append((_x, _y))
+            row.append(tuple(points))
+        affected.append(tuple(row))
+    return tuple(affected)
+
+
+class AI:
+    def __init__(self, line_points, chessman, checkerboard=None, vectorized=False):
+        """
+        :param checkerboard: 與介面共用的 Checkerboard（或 BitBoard）；省略時 AI 自行維護一份棋盤
+        :param vectorized: 以 NumPy 一次算出整個棋盤的分數（threatmap），取代逐點評分
+        """
+        self._line_points = line_points
+        self._my = chessman
+        self._opponent = BLACK_CHESSMAN if chessman == WHITE_CHESSMAN else WHITE_CHESSMAN
+        self._shared = checkerboard is not None
+        if isinstance(checkerboard, Checkerboard):
+            checkerboard = checkerboard.board
+        self._board = checkerboard if self._shared else BitBoard(line_points)
+        self._checkerboard = self._board.cells
+        # 評分快取：_scores[y][x] 為 None 表示需重新評分
+        self._scores = [[None] * line_points for _ in range(line_points)]
+        self._affected = _affected_points(line_points)
+        self._board.subscribe(self._invalidate)
+        self.rescored = 0    # 實際重新評分的次數
+        self.cache_hits = 0  # 直接取用快取的次數
+        self._threat_map = threatmap.ThreatMap(self._board, PATTERN_TABLE) if vectorized else None
+
+    @property
+    def vectorized(self):
+        return self._threat_map is not None
+
+    def get_opponent_drop(self, point):
+        # 共用棋盤時對方的子已由 Checkerboard.drop 落下
+        if self._checkerboard[point.Y][point.X] == 0:
+            self._board.place(point.X, point.Y, self._opponent.Value)
+
+    def AI_drop(self):
+        point = None
+        score = 0
+        heat = self.evaluate_all() if self.vectorized else None
+        # 只看已有棋子附近的候選點，遠處的空點不可能是最佳點
+        for candidate in self._board.candidates:
+            if heat is not None:
+                _score = heat[candidate.Y, candidate.X]
+            else:
+                _score = self.get_point_score(candidate.X, candidate.Y)
+            if _score > score:
+                score = _score
+                point = candidate
+            elif _score == score and _score > 0:
+                r = random.randint(0, 100)
+                if r % 2 == 0:
+                    point = candidate
+        if point is None:
+            # 棋盤上還沒有棋子
+            point = Point(self._line_points // 2, self._line_points // 2)
+        if not self._shared:
+            self._board.place(point.X, point.Y, self._my.Value)
+        return point
+
+    def get_candidates(self):
+        """候選點依威脅程度（棋型評分）由高到低排序，回傳 [(分數, Point)]"""
+        if self.vectorized:
+            return self._threat_map.ranked_moves(self._my.Value)
+        moves = [(self.get_point_score(point.X, point.Y), point) for point in self._board.candidates]
+        # 同分時依位置排序，使順序不受落子、悔棋的先後影響
+        moves.sort(key=lambda move: (-move[0], move[1].Y, move[1].X))
+        return moves
+
+    def evaluate_all(self):
+        """
+        一次評估所有落點
+        :return: (n, n) 陣列，以 [y, x] 取值，空點為棋型評分，有子的點為 0
+        """
+        if self.vectorized:
+            return self._threat_map.scores(self._my.Value)
+        heat = np.zeros((self._line_points, self._line_points))
+        for y, row in enumerate(self._checkerboard):
+            for x, cell in enumerate(row):
+                if cell == 0:
+                    heat[y, x] = self.get_point_score(x, y)
+        return heat
+
+    def get_point_score(self, x, y):
+        """(x, y) 的棋型評分，僅在附近棋子有變動時才重新計算"""
+        score = self._scores[y][x]
+        if score is None:
+            score = self._get_point_score(Point(x, y))
+            self._scores[y][x] = score
+            self.rescored += 1
+        else:
+            self.cache_hits += 1
+        return score
+
+    def _invalidate(self, x, y):
+        scores = self._scores
+        for _x, _y in self._affected[y][x]:
+            scores[_y][_x] = None
+
+    def _get_point_score(self, point):
+        # 四個方向各查一次表，結果與逐方向呼叫 _get_direction_score 相同
+        return patterns.point_score(PATTERN_TABLE, self._board, self._my.Value, point.X, point.Y)
+
+    def _get_direction_score(self, point, x_offset, y_offset):
+        count = 0   # 落子处我方连续子数
+        _count = 0  # 落子处对方连续子数
+        space = None   # 我方连续子中有无空格
+        _space = None  # 对方连续子中有无空格
+        both = 0    # 我方连续子两端有无阻挡
+        _both = 0   # 对方连续子两端有无阻挡
+
+        # 如果是 1 表示是边上是我方子，2 表示敌方子
+        flag = self._get_stone_color(point, x_offset, y_offset, True)
+        if flag != 0:
+            for step in range(1, 6):
+                x = point.X + step * x_offset
+                y = point.Y + step * y_offset
+                if 0 <= x < self._line_points and 0 <= y < self._line_points:
+                    if flag == 1:
+                        if self._checkerboard[y][x] == self._my.Value:
+                            count += 1
+                            if space is False:
+                                space = True
+                        elif self._checkerboard[y][x] == self._opponent.Value:
+                            _both += 1
+                            break
+                        else:
+                            if space is None:
+                                space = False
+                            else:
+                                break   # 遇到第二个空格退出
+                    elif flag == 2:
+                        if self._checkerboard[y][x] == self._my.Value:
+                            _both += 1
+                            break
+                        elif self._checkerboard[y][x] == self._opponent.Value:
+                            _count += 1
+                            if _space is False:
+                                _space = True
+                        else:
+                            if _space is None:
+                                _space = False
+                            else:
+                                break
+                else:
+                    # 遇到边也就是阻挡
+                    if flag == 1:
+                        both += 1
+                    elif flag == 2:
+                        _both += 1
+
+        if space is False:
+            space = None
+        if _space is False:
+            _space = None
+
+        _flag = self._get_stone_color(point, -x_offset, -y_offset, True)
+        if _flag != 0:
+            for step in range(1, 6):
+                x = point.X - step * x_offset
+                y = point.Y - step * y_offset
+                if 0 <= x < self._line_points and 0 <= y < self._line_points:
+                    if _flag == 1:
+                        if self._checkerboard[y][x] == self._my.Value:
+                            count += 1
+                            if space is False:
+                                space = True
+                        elif self._checkerboard[y][x] == self._opponent.Value:
+                            _both += 1
+                            break
+                        else:
+                            if space is None:
+                                space = False
+                            else:
+                                break   # 遇到第二个空格退出
+                    elif _flag == 2:
+                        if self._checkerboard[y][x] == self._my.Value:
+                            _both += 1
+                            break
+                        elif self._checkerboard[y][x] == self._opponent.Value:
+                            _count += 1
+                            if _space is False:
+                                _space = True
+                        else:
+                            if _space is None:
+                                _space = False
+                            else:
+                                break
+                else:
+                    # 遇到边也就是阻挡
+                    if _flag == 1:
+                        both += 1
+                    elif _flag == 2:
+                        _both += 1
+
+        score = 0
+        if count == 4:
+            score = 10000
+        elif _count == 4:
+            score = 9000
+        elif count == 3:
+            if both == 0:
+                score = 1000
+            elif both == 1:
+                score = 100
+            else:
+                score = 0
+        elif _count == 3:
+            if _both == 0:
+                score = 900
+            elif _both == 1:
+                score = 90
+            else:
+                score = 0
+        elif count == 2:
+            if both == 0:
+                score = 100
+            elif both == 1:
+                score = 10
+            else:
+                score = 0
+        elif _count == 2:
+            if _both == 0:
+                score = 90
+            elif _both == 1:
+                score = 9
+            else:
+                score = 0
+        elif count == 1:
+            score = 10
+        elif _count == 1:
+            score = 9
+        else:
+            score = 0
+
+        if space or _space:
+            score /= 2
+
+        return score
+
+    # 判断指定位置处在指定方向上是我方子、对方子、空
+    def _get_stone_color(self, point, x_offset, y_offset, next):
+        x = point.X + x_offset
+        y = point.Y + y_offset
+        if 0 <= x < self._line_points and 0 <= y < self._line_points:
+            if self._checkerboard[y][x] == self._my.Value:
+                return 1
+            elif self._checkerboard[y][x] == self._opponent.Value:
+                return 2
+            else:
+                if next:
+                    return self._get_stone_color(Point(x, y), x_offset, y_offset, False)
+                else:
+                    return 0
+        else:
+            return 0
+
+
+_window_scorers = {}
+
+
+def _window_score(left, right, cells):
+    """以 _get_direction_score 為準計算一個視窗的分數，供建立查表用"""
+    # 在寬 left + 1 + right 的棋盤第 0 列重現這個視窗，黑子為己方
+    line_points = left + 1 + right
+    scorer = _window_scorers.get(line_points)
+    if scorer is None:
+        scorer = _window_scorers[line_points] = AI(line_points, BLACK_CHESSMAN)
+    scorer._checkerboard[0][:] = cells[patterns.RADIUS - left:patterns.RADIUS + right + 1]
+    return scorer._get_direction_score(Point(left, 0), 1, 0)
+
+
+PATTERN_TABLE = patterns.load_table(_window_score)
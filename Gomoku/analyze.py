@@ -0,0 +1,170 @@
+"""
+五子棋批次局面分析：讀入局面檔，分散到多個行程讓 AI 逐一分析，每完成一個局面就輸出一行 JSON
+
+    python analyze.py positions.txt --engine search:normal --jobs 4 > results.jsonl
+
+局面檔每行一個局面，以空白分隔：
+    棋盤          line_points ** 2 個字元，由上而下逐列，'.' 為空、'X' 為黑子、'O' 為白子
+    輪到哪方      選填，'b' 或 'w'；省略時黑白子數相同則為黑方，否則為白方
+    預期落點      選填，'x,y'，可有多個以 ';' 分隔；有填時會統計 AI 的命中率
+空行與 '#' 開頭的行略過
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, Checkerboard
+from engines import create_engine
+
+DEFAULT_ENGINE = 'search:normal'
+TOP_MOVES = 5   # 輸出棋型評分最高的幾個候選點
+
+_STONES = {'.': 0, 'X': BLACK_CHESSMAN.Value, 'O': WHITE_CHESSMAN.Value}
+_SIDES = {'b': BLACK_CHESSMAN, 'w': WHITE_CHESSMAN}
+
+
+def parse_position(line):
+    """
+    :return: (line_points, 棋盤 cells[y][x], 輪到的 Chessman, 預期落點 [Point])
+    """
+    fields = line.split()
+    if not fields:
+        raise ValueError('空白的局面')
+    text = fields[0].upper()
+    n = math.isqrt(len(text))
+    if n * n != len(text):
+        raise ValueError(f'棋盤長度 {len(text)} 不是平方數')
+    try:
+        stones = [_STONES[c] for c in text]
+    except KeyError as e:
+        raise ValueError(f'無法辨識的棋子 {e.args[0]!r}') from None
+    cells = [stones[y * n:(y + 1) * n] for y in range(n)]
+    side = None
+    expected = []
+    for field in fields[1:]:
+        if field.lower() in _SIDES:
+            side = _SIDES[field.lower()]
+            continue
+        for move in field.split(';'):
+            x, y = move.split(',')
+            expected.append(Point(int(x), int(y)))
+    if side is None:
+        blacks = stones.count(BLACK_CHESSMAN.Value)
+        whites = stones.count(WHITE_CHESSMAN.Value)
+        side = BLACK_CHESSMAN if blacks == whites else WHITE_CHESSMAN
+    return n, cells, side, expected
+
+
+def format_position(checkerboard, side=None, expected=()):
+    """把 Checkerboard 寫成局面檔的一行"""
+    symbols = {0: '.', BLACK_CHESSMAN.Value: 'X', WHITE_CHESSMAN.Value: 'O'}
+    fields = [''.join(symbols[cell] for row in checkerboard.checkerboard for cell in row)]
+    if side is not None:
+        fields.append('b' if side == BLACK_CHESSMAN else 'w')
+    if expected:
+        fields.append(';'.join(f'{point.X},{point.Y}' for point in expected))
+    return ' '.join(fields)
+
+
+def analyze(number, line, engine_spec=DEFAULT_ENGINE, top=TOP_MOVES):
+    """
+    分析一個局面（行程池的工作）
+    :param number: 在局面檔中的行號
+    :return: 可直接寫成 JSON 的結果
+    """
+    result = {'line': number}
+    try:
+        n, cells, side, expected = parse_position(line)
+    except ValueError as e:
+        result['error'] = str(e)
+        return result
+    checkerboard = Checkerboard(n, verbose=False)
+    for y, row in enumerate(cells):
+        for x, cell in enumerate(row):
+            if cell:
+                checkerboard.board.place(x, y, cell)
+    engine = create_engine(engine_spec, n, side, checkerboard)
+    start = time.perf_counter()
+    try:
+        best = engine.AI_drop()
+    finally:
+        close = getattr(engine, 'close', None)
+        if close is not None:
+            close()
+    elapsed = time.perf_counter() - start
+    stats = getattr(engine, 'stats', {})
+    result.update({
+        'side': 'black' if side == BLACK_CHESSMAN else 'white',
+        'best': list(best),
+        'score': stats.get('score'),
+        'depth': stats.get('depth'),
+        'nodes': stats.get('nodes', 0),
+        'time': elapsed,
+        'candidates': [[point.X, point.Y, score] for score, point in engine.get_candidates()[:top]],
+    })
+    if 'threat_sequence' in stats:
+        result['threat_sequence'] = [list(point) for point in stats['threat_sequence']]
+    if expected:
+        result['expected'] = [list(point) for point in expected]
+        result['match'] = best in expected
+    return result
+
+
+def read_positions(f):
+    """:return: 逐一產生 (行號, 局面)，行號從 1 起算"""
+    for number, line in enumerate(f, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield number, line
+
+
+def run(positions, engine_spec=DEFAULT_ENGINE, jobs=None, top=TOP_MOVES):
+    """
+    :param positions: [(行號, 局面)]
+    :return: 依完成順序逐一產生結果
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(analyze, number, line, engine_spec, top) for number, line in positions]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='五子棋批次局面分析')
+    parser.add_argument('positions', help="局面檔，'-' 為標準輸入")
+    parser.add_argument('--engine', default=DEFAULT_ENGINE, help='AI 名稱（見 engines.create_engine）')
+    parser.add_argument('--jobs', type=int, default=None, help='行程數（預設為 CPU 核心數）')
+    parser.add_argument('--top', type=int, default=TOP_MOVES, help='輸出的候選點數')
+    args = parser.parse_args()
+
+    if args.positions == '-':
+        positions = list(read_positions(sys.stdin))
+    else:
+        with open(args.positions, encoding='utf-8') as f:
+            positions = list(read_positions(f))
+
+    started = time.perf_counter()
+    done = errors = checked = matched = 0
+    for result in run(positions, args.engine, args.jobs, args.top):
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        done += 1
+        if 'error' in result:
+            errors += 1
+        elif 'match' in result:
+            checked += 1
+            matched += result['match']
+    elapsed = time.perf_counter() - started
+    summary = f'共 {done} 個局面，{elapsed:.1f} 秒（{done / elapsed if elapsed else 0:.1f} 個/秒）'
+    if errors:
+        summary += f'，{errors} 個格式錯誤'
+    if checked:
+        summary += f'，預期落點命中 {matched}/{checked}'
+    print(summary, file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
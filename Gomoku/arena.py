@@ -0,0 +1,170 @@
+"""
+五子棋 AI 對戰場：不開視窗，讓兩種 AI 設定對下 N 局，分散到多個行程執行，
+統計勝率、每步耗時、每秒搜尋節點數與對局長度，結果寫成 JSON 以便比較不同版本
+
+    python arena.py greedy search:normal --games 20 --jobs 4 --output result.json
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, Checkerboard
+from engines import create_engine
+
+LINE_POINTS = 19
+OPENING_MOVES = 2   # 開局在中央隨機落下的子數，讓確定性的 AI 也能下出不同的對局
+OPENING_RADIUS = 3  # 開局子距離天元的最大距離
+
+
+def play_game(black, white, seed, line_points=LINE_POINTS, opening=OPENING_MOVES):
+    """
+    下一局
+    :param black: 執黑的 AI 名稱（見 engines.create_engine）
+    :param white: 執白的 AI 名稱
+    :param seed: 亂數種子，決定開局與 AI 同分時的選擇
+    :return: 對局記錄 dict
+    """
+    random.seed(seed)
+    checkerboard = Checkerboard(line_points, verbose=False)
+    engines = {BLACK_CHESSMAN: create_engine(black, line_points, BLACK_CHESSMAN, checkerboard),
+               WHITE_CHESSMAN: create_engine(white, line_points, WHITE_CHESSMAN, checkerboard)}
+    think_time = {BLACK_CHESSMAN: 0.0, WHITE_CHESSMAN: 0.0}
+    nodes = {BLACK_CHESSMAN: 0, WHITE_CHESSMAN: 0}
+    thinks = {BLACK_CHESSMAN: 0, WHITE_CHESSMAN: 0}
+
+    cur_runner = BLACK_CHESSMAN
+    winner = None
+    center = line_points // 2
+    last_point = None
+    while len(checkerboard.moves) < line_points * line_points:
+        if len(checkerboard.moves) < opening:
+            point = Point(center + random.randint(-OPENING_RADIUS, OPENING_RADIUS),
+                          center + random.randint(-OPENING_RADIUS, OPENING_RADIUS))
+            if not checkerboard.can_drop(point):
+                continue
+        else:
+            engine = engines[cur_runner]
+            if last_point is not None:
+                engine.get_opponent_drop(last_point)
+            start = time.perf_counter()
+            point = engine.AI_drop()
+            think_time[cur_runner] += time.perf_counter() - start
+            nodes[cur_runner] += getattr(engine, 'stats', {}).get('nodes', 0)
+            thinks[cur_runner] += 1
+        winner = checkerboard.drop(cur_runner, point)
+        last_point = point
+        if winner is not None:
+            break
+        cur_runner = WHITE_CHESSMAN if cur_runner == BLACK_CHESSMAN else BLACK_CHESSMAN
+    for engine in engines.values():
+        # 使用行程池的 AI（如 mcts:<秒數>:<行程數>）需要結束其行程
+        close = getattr(engine, 'close', None)
+        if close is not None:
+            close()
+
+    return {
+        'seed': seed,
+        'black': black,
+        'white': white,
+        'winner': {BLACK_CHESSMAN: 'black', WHITE_CHESSMAN: 'white'}.get(winner),
+        'length': len(checkerboard.moves),
+        'moves': [list(point) for point in checkerboard.moves],
+        'think_time': {'black': think_time[BLACK_CHESSMAN], 'white': think_time[WHITE_CHESSMAN]},
+        'thinks': {'black': thinks[BLACK_CHESSMAN], 'white': thinks[WHITE_CHESSMAN]},
+        'nodes': {'black': nodes[BLACK_CHESSMAN], 'white': nodes[WHITE_CHESSMAN]},
+    }
+
+
+def summarize(first, second, games):
+    """依 AI 名稱（而非黑白）彙總：勝率、平均每步耗時、每秒節點數、平均對局長度"""
+    summary = {}
+    for spec in (first, second):
+        if spec in summary:
+            continue
+        wins = think_time = thinks = nodes = 0
+        for game in games:
+            for color in ('black', 'white'):
+                if game[color] != spec:
+                    continue
+                wins += game['winner'] == color
+                think_time += game['think_time'][color]
+                thinks += game['thinks'][color]
+                nodes += game['nodes'][color]
+        summary[spec] = {
+            'wins': wins,
+            'win_rate': wins / len(games) if games else 0.0,
+            'avg_move_latency': think_time / thinks if thinks else 0.0,
+            'nodes_per_second': nodes / think_time if think_time else 0.0,
+        }
+    draws = sum(game['winner'] is None for game in games)
+    return {
+        'games': len(games),
+        'draws': draws,
+        'avg_length': sum(game['length'] for game in games) / len(games) if games else 0.0,
+        'engines': summary,
+    }
+
+
+def run(first, second, games, seed=0, jobs=None, line_points=LINE_POINTS, opening=OPENING_MOVES, progress=None):
+    """
+    兩種 AI 輪流執黑對下 games 局
+    :param jobs: 行程數，None 為 CPU 核心數
+    :param progress: 每局結束時呼叫 progress(完成局數, 對局記錄)
+    :return: 可直接寫成 JSON 的結果
+    """
+    started = time.time()
+    records = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for i in range(games):
+            black, white = (first, second) if i % 2 == 0 else (second, first)
+            futures.append(executor.submit(play_game, black, white, seed + i, line_points, opening))
+        for future in as_completed(futures):
+            record = future.result()
+            records.append(record)
+            if progress is not None:
+                progress(len(records), record)
+    records.sort(key=lambda record: record['seed'])
+    return {
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+        'wall_time': time.time() - started,
+        'config': {'first': first, 'second': second, 'games': games, 'seed': seed,
+                   'jobs': jobs or os.cpu_count(), 'line_points': line_points, 'opening': opening},
+        'summary': summarize(first, second, records),
+        'games': records,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='五子棋 AI 對戰場')
+    parser.add_argument('first', help="AI 名稱，如 greedy、search:normal、search:0.5、mcts:1:4")
+    parser.add_argument('second', help='另一個 AI 名稱')
+    parser.add_argument('--games', type=int, default=10, help='對局數，雙方輪流執黑')
+    parser.add_argument('--seed', type=int, default=0, help='第一局的亂數種子，之後每局加一')
+    parser.add_argument('--jobs', type=int, default=None, help='行程數（預設為 CPU 核心數）')
+    parser.add_argument('--opening', type=int, default=OPENING_MOVES, help='開局隨機落子數')
+    parser.add_argument('--output', default=None, help='結果 JSON 路徑（預設 arena-<時間>.json）')
+    args = parser.parse_args()
+
+    def progress(done, record):
+        print(f"[{done}/{args.games}] seed={record['seed']} 黑={record['black']} 白={record['white']} "
+              f"勝方={record['winner'] or '和局'} 手數={record['length']}")
+
+    result = run(args.first, args.second, args.games, args.seed, args.jobs, opening=args.opening, progress=progress)
+    output = args.output or time.strftime('arena-%Y%m%d-%H%M%S.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    summary = result['summary']
+    print(f"共 {summary['games']} 局，和局 {summary['draws']}，平均 {summary['avg_length']:.1f} 手")
+    for spec, stats in summary['engines'].items():
+        print(f"{spec}: 勝率 {stats['win_rate'] * 100:.1f}%，每步 {stats['avg_move_latency'] * 1000:.1f} ms，"
+              f"{stats['nodes_per_second']:.0f} 節點/秒")
+    print(f'結果已寫入 {output}')
+
+
+if __name__ == '__main__':
+    main()
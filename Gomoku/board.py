@@ -0,0 +1,275 @@
+"""五子棋棋盤：以位元遮罩記錄每條線上的棋子，供介面與 AI 共用"""
+
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+Chessman = namedtuple('Chessman', 'Name Value Color')
+Point = namedtuple('Point', 'X Y')
+
+BLACK_CHESSMAN = Chessman('黑子', 1, (45, 45, 45))
+WHITE_CHESSMAN = Chessman('白子', 2, (219, 219, 219))
+
+offset = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+CANDIDATE_DISTANCE = 2  # 候選點：距離已有棋子 2 格內的空點
+
+
+def _window(pos, length):
+    """以 pos 為中心、左右各 4 格（不超出線長）的位元範圍"""
+    lo = max(0, pos - 4)
+    hi = min(length - 1, pos + 4)
+    return ((1 << (hi - lo + 1)) - 1) << lo
+
+
+@lru_cache(maxsize=None)
+def _line_keys(line_points):
+    """
+    每個點在四個方向上所屬的線、位元與九格視窗
+    :return: keys[y][x] = ((線索引, 位元, 視窗遮罩), ...)，方向順序同 offset
+    """
+    n = line_points
+    keys = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            row.append(((y, 1 << x, _window(x, n)),                   # 橫線，以 x 為位元
+                        (x, 1 << y, _window(y, n)),                   # 直線，以 y 為位元
+                        (x - y + n - 1, 1 << x, _window(x, n)),       # 主對角線
+                        (x + y, 1 << x, _window(x, n))))              # 副對角線
+        keys.append(tuple(row))
+    return tuple(keys)
+
+
+@lru_cache(maxsize=None)
+def _line_spans(line_points):
+    """
+    每條線佔用的位元範圍
+    :return: spans[方向][線索引] = (最低位元, 最高位元)
+    """
+    n = line_points
+    straight = tuple((0, n - 1) for _ in range(n))
+    diag = tuple((max(0, i - n + 1), min(n - 1, i)) for i in range(2 * n - 1))
+    return straight, straight, diag, diag
+
+
+@lru_cache(maxsize=None)
+def _neighbors(line_points):
+    """
+    每個點周圍 CANDIDATE_DISTANCE 格內（不含自己）的點
+    :return: neighbors[y][x] = (Point, ...)
+    """
+    n = line_points
+    d = CANDIDATE_DISTANCE
+    return tuple(tuple(tuple(Point(_x, _y)
+                             for _y in range(max(0, y - d), min(n, y + d + 1))
+                             for _x in range(max(0, x - d), min(n, x + d + 1))
+                             if _x != x or _y != y)
+                       for x in range(n))
+                 for y in range(n))
+
+
+@lru_cache(maxsize=None)
+def _zobrist_table(line_points):
+    """
+    Zobrist 雜湊用的隨機數，固定種子使同一局面在各行程中雜湊一致
+    :return: table[value][y][x]
+    """
+    rnd = random.Random(line_points)
+    return (None,) + tuple(tuple(tuple(rnd.getrandbits(64) for _ in range(line_points))
+                                 for _ in range(line_points))
+                           for _ in range(2))
+
+
+def has_five(mask):
+    """遮罩中是否有連續 5 個（含以上）位元"""
+    m = mask & (mask >> 1)
+    m &= m >> 2
+    return m & (mask >> 4) != 0
+
+
+class BitBoard:
+    """
+    每種棋子在每條橫線、直線、兩種斜線上各用一個整數記錄，
+    落子只需設定 4 個位元，判斷五連只需數次位移與 AND
+    """
+
+    def __init__(self, line_points):
+        self._line_points = line_points
+        self._cells = [[0] * line_points for _ in range(line_points)]
+        self._keys = _line_keys(line_points)
+        self._spans = _line_spans(line_points)
+        # _lines[value][方向][線索引]，value 為 1（黑）或 2（白）
+        self._lines = [None] + [[[0] * line_points, [0] * line_points,
+                                 [0] * (2 * line_points - 1), [0] * (2 * line_points - 1)]
+                                for _ in range(2)]
+        self._count = 0
+        self._zobrist = _zobrist_table(line_points)
+        self._hash = 0
+        self._listeners = []
+        # _near[y][x]：周圍 CANDIDATE_DISTANCE 格內的棋子數；
+        # _candidates 以 dict 保持加入順序，使候選點的列舉順序固定
+        self._neighbors = _neighbors(line_points)
+        self._near = [[0] * line_points for _ in range(line_points)]
+        self._candidates = {}
+
+    @property
+    def line_points(self):
+        return self._line_points
+
+    @property
+    def cells(self):
+        """二維陣列 cells[y][x]，0 為空"""
+        return self._cells
+
+    @property
+    def count(self):
+        """棋盤上的棋子數"""
+        return self._count
+
+    @property
+    def hash(self):
+        """目前局面的 Zobrist 雜湊，隨落子與移除增量更新"""
+        return self._hash
+
+    @property
+    def candidates(self):
+        """距離已有棋子 CANDIDATE_DISTANCE 格內的空點（Point），隨落子增量維護"""
+        return self._candidates.keys()
+
+    def get(self, x, y):
+        return self._cells[y][x]
+
+    def subscribe(self, listener):
+        """登記 listener(x, y)，每次落子或移除後呼叫，供快取失效用"""
+        self._listeners.append(listener)
+
+    def place(self, x, y, value):
+        self._cells[y][x] = value
+        lines = self._lines[value]
+        for k, (i, bit, _) in enumerate(self._keys[y][x]):
+            lines[k][i] |= bit
+        self._count += 1
+        self._hash ^= self._zobrist[value][y][x]
+        self._candidates.pop(Point(x, y), None)
+        cells, near = self._cells, self._near
+        for point in self._neighbors[y][x]:
+            near[point.Y][point.X] += 1
+            if cells[point.Y][point.X] == 0:
+                self._candidates[point] = None
+        for listener in self._listeners:
+            listener(x, y)
+
+    def remove(self, x, y):
+        value = self._cells[y][x]
+        self._cells[y][x] = 0
+        lines = self._lines[value]
+        for k, (i, bit, _) in enumerate(self._keys[y][x]):
+            lines[k][i] &= ~bit
+        self._count -= 1
+        self._hash ^= self._zobrist[value][y][x]
+        cells, near = self._cells, self._near
+        for point in self._neighbors[y][x]:
+            near[point.Y][point.X] -= 1
+            if near[point.Y][point.X] == 0:
+                self._candidates.pop(point, None)
+        if near[y][x]:
+            self._candidates[Point(x, y)] = None
+        for listener in self._listeners:
+            listener(x, y)
+
+    def masks(self, value):
+        """value 棋子的所有線遮罩：masks[方向][線索引]，方向順序同 offset"""
+        return self._lines[value]
+
+    def line_mask(self, value, direction, x, y):
+        """
+        取得經過 (x, y) 的某方向整條線上 value 棋子的遮罩
+        :return: (遮罩, 該點在遮罩中的位元)
+        """
+        i, bit, _ = self._keys[y][x][direction]
+        return self._lines[value][direction][i], bit
+
+    def lines(self):
+        """逐條回傳有棋子的線：(黑子遮罩, 白子遮罩, 最低位元, 最高位元)"""
+        black, white = self._lines[1], self._lines[2]
+        for k, spans in enumerate(self._spans):
+            black_k, white_k = black[k], white[k]
+            for i, (lo, hi) in enumerate(spans):
+                if black_k[i] or white_k[i]:
+                    yield black_k[i], white_k[i], lo, hi
+
+    def is_five(self, x, y):
+        """(x, y) 上的棋子是否連成五子"""
+        value = self._cells[y][x]
+        if value == 0:
+            return False
+        lines = self._lines[value]
+        # 九格視窗內的五連必定經過中心點
+        for k, (i, _, window) in enumerate(self._keys[y][x]):
+            if has_five(lines[k][i] & window):
+                return True
+        return False
+
+
+class Checkerboard:
+    def __init__(self, line_points, verbose=True):
+        """
+        :param verbose: 是否在落子與獲勝時印出訊息
+        """
+        self._line_points = line_points
+        self._verbose = verbose
+        self._board = BitBoard(line_points)
+        self._checkerboard = self._board.cells
+        self._moves = []
+
+    def _get_checkerboard(self):
+        return self._checkerboard
+
+    checkerboard = property(_get_checkerboard)
+
+    @property
+    def board(self):
+        """底層的 BitBoard，可與 AI 共用"""
+        return self._board
+
+    @property
+    def moves(self):
+        """依序落下的棋子位置"""
+        return self._moves
+
+    # 判断是否可落子
+    def can_drop(self, point):
+        return self._checkerboard[point.Y][point.X] == 0
+
+    def drop(self, chessman, point):
+        """
+        落子
+        :param chessman:
+        :param point:落子位置
+        :return:若该子落下之后即可获胜，则返回获胜方，否则返回 None
+        """
+        if self._verbose:
+            print(f'{chessman.Name} ({point.X}, {point.Y})')
+        self._board.place(point.X, point.Y, chessman.Value)
+        self._moves.append(point)
+
+        if self._win(point):
+            if self._verbose:
+                print(f'{chessman.Name}贏得勝利')
+            return chessman
+
+    def undo(self):
+        """
+        悔棋
+        :return: 被移除的最後一手位置，沒有棋子時回傳 None
+        """
+        if not self._moves:
+            return None
+        point = self._moves.pop()
+        self._board.remove(point.X, point.Y)
+        return point
+
+    # 判断是否赢了
+    def _win(self, point):
+        return self._board.is_five(point.X, point.Y)
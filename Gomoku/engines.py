@@ -0,0 +1,44 @@
+"""依名稱建立 AI，供對戰場、批次分析等無介面的工具共用"""
+
+from ai import AI
+from search import SearchAI, Budget, LEVELS, DEFAULT_LEVEL
+from mcts import MCTSAI, DEFAULT_TIME
+
+
+def create_engine(spec, line_points, chessman, checkerboard=None):
+    """
+    :param spec: 'greedy' 為逐點評分的 AI；
+                 'search' / 'search:<難度>' 為 alpha-beta 搜尋，難度可為 LEVELS 的名稱或每步秒數，如 'search:0.5'；
+                 'mcts' / 'mcts:<秒數>' / 'mcts:<秒數>:<行程數>' 為蒙地卡羅樹搜尋，如 'mcts:1:4'；
+                 加上 '+numpy' 後綴改以 NumPy 一次評分整個棋盤，如 'greedy+numpy'、'search:hard+numpy'
+    :param checkerboard: 與呼叫端共用的 Checkerboard；省略時 AI 自行維護棋盤
+    """
+    base, _, suffix = spec.partition('+')
+    if suffix not in ('', 'numpy'):
+        raise ValueError(f'未知的 AI：{spec}')
+    vectorized = suffix == 'numpy'
+    name, _, option = base.partition(':')
+    if name == 'greedy':
+        return AI(line_points, chessman, checkerboard, vectorized)
+    if name == 'search':
+        return SearchAI(line_points, chessman, checkerboard, _parse_level(option), vectorized=vectorized)
+    if name == 'mcts' and not vectorized:
+        seconds, _, workers = option.partition(':')
+        try:
+            return MCTSAI(line_points, chessman, checkerboard, float(seconds) if seconds else DEFAULT_TIME,
+                          int(workers) if workers else 1)
+        except ValueError:
+            raise ValueError(f'未知的 AI：{spec}') from None
+    raise ValueError(f'未知的 AI：{spec}')
+
+
+def _parse_level(option):
+    if not option:
+        return DEFAULT_LEVEL
+    if option in LEVELS:
+        return option
+    try:
+        seconds = float(option)
+    except ValueError:
+        raise ValueError(f'未知的難度：{option}') from None
+    return Budget(seconds, None, LEVELS['hard'].max_depth)
@@ -0,0 +1,144 @@
+"""
+對局伺服器的壓力測試：模擬多個客戶端同時與電腦對下，統計每手的往返延遲與整體每秒手數
+
+    python server.py --port 5555 &
+    python loadtest.py --clients 50 --games 2 --engine search:easy
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import threats
+from board import Point, BitBoard
+
+LINE_POINTS = 19
+TACTICS = 0.5       # 每手先檢查能否連五、是否要擋住對方的四的機率
+
+
+class SimulatedClient:
+    """在候選點中隨機落子的玩家，偶爾選擇直接連五或擋住對方的四"""
+
+    def __init__(self, reader, writer, seed):
+        self._reader = reader
+        self._writer = writer
+        self._random = random.Random(seed)
+        self.latencies = []
+        self.moves = 0
+        self.results = []
+
+    async def send(self, message):
+        self._writer.write((json.dumps(message) + '\n').encode('utf-8'))
+        await self._writer.drain()
+
+    async def receive(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError('伺服器已關閉連線')
+        return json.loads(line)
+
+    async def play(self, engine, color):
+        await self.send({'op': 'new', 'engine': engine, 'color': color})
+        board = None
+        value = 1 if color == 'black' else 2
+        sent = None
+        while True:
+            message = await self.receive()
+            op = message['op']
+            if op == 'error':
+                raise RuntimeError(message['message'])
+            if op == 'started':
+                board = BitBoard(message['line_points'])
+                if color == 'black':
+                    sent = await self._move(board, value)
+            elif op == 'move':
+                board.place(message['x'], message['y'], 1 if message['color'] == 'black' else 2)
+                if message['color'] != color:
+                    if sent is not None:
+                        self.latencies.append(time.perf_counter() - sent)
+                    # 對方這手連成五子或下滿棋盤時，伺服器接著會送 end，不能再落子
+                    if not board.is_five(message['x'], message['y']) and board.count < board.line_points ** 2:
+                        sent = await self._move(board, value)
+            elif op == 'end':
+                self.results.append(message['winner'] == color)
+                return
+
+    async def _move(self, board, value):
+        point = None
+        if self._random.random() < TACTICS:
+            point = self._tactical_move(board, value)
+        if point is None:
+            candidates = list(board.candidates)
+            if not candidates:
+                center = board.line_points // 2
+                point = Point(center, center)
+            else:
+                point = self._random.choice(candidates)
+        await self.send({'op': 'move', 'x': point.X, 'y': point.Y})
+        self.moves += 1
+        return time.perf_counter()
+
+    def _tactical_move(self, board, value):
+        """:return: 能直接連五的點，沒有時為擋住對方成五的點，都沒有時為 None"""
+        for side in (value, 3 - value):
+            fives = threats.scan(board, side, threes=False).fives
+            if fives:
+                return self._random.choice(sorted(fives))
+        return None
+
+
+async def _connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def _run_client(args, number):
+    reader, writer = await _connect(args)
+    client = SimulatedClient(reader, writer, args.seed + number)
+    try:
+        for game in range(args.games):
+            await client.play(args.engine, 'black' if (number + game) % 2 == 0 else 'white')
+    finally:
+        writer.close()
+    return client
+
+
+async def _run(args):
+    started = time.perf_counter()
+    clients = await asyncio.gather(*(_run_client(args, i) for i in range(args.clients)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await _connect(args)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    server_stats = json.loads(await reader.readline())
+    writer.close()
+
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    moves = sum(client.moves for client in clients)
+    games = sum(len(client.results) for client in clients)
+    print(f'{args.clients} 個客戶端同時對局，共 {games} 局，{elapsed:.1f} 秒')
+    print(f'客戶端：{moves} 手，每手往返延遲平均 {sum(latencies) / len(latencies) * 1000:.0f} ms，'
+          f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms，最大 {latencies[-1] * 1000:.0f} ms'
+          if latencies else f'客戶端：{moves} 手')
+    print(f"伺服器：累計 {server_stats['moves']} 手，{server_stats['moves_per_second']:.1f} 手/秒，"
+          f"電腦 {server_stats['ai_moves']} 手")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='五子棋對局伺服器壓力測試')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--unix', default=None, help='改用 Unix socket 的路徑')
+    parser.add_argument('--clients', type=int, default=20, help='同時對局的客戶端數')
+    parser.add_argument('--games', type=int, default=1, help='每個客戶端下幾局')
+    parser.add_argument('--engine', default='search:easy', help='電腦使用的 AI')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+五子棋蒙地卡羅樹搜尋：UCT 選擇，模擬時依棋型評分落子（同分才隨機）而非完全隨機，
+模擬數手後仍未分勝負時以靜態評估估計勝率。
+多個行程各自從根節點建樹（root parallelization），時間到時把各棵樹根節點的統計相加後選點
+"""
+
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, BitBoard
+from ai import AI
+from search import evaluate, WIN_BOUND
+
+DEFAULT_TIME = 1.0      # 每步秒數
+EXPLORATION = 1.0       # UCT 的探索係數
+EXPAND_WIDTH = 10       # 每個節點只展開評分最高的幾手
+PLAYOUT_DEPTH = 4       # 模擬最多下幾手，之後以靜態評估決定勝率；模擬得太長反而因雜訊變弱
+EVAL_SCALE = 300.0      # 靜態評估換算成勝率時的尺度
+CANCEL_POLL = 0.05      # 行程池搜尋時每隔幾秒檢查一次是否被取消
+
+_cancelled_job = None   # 行程池的行程中：與主行程共用、記錄被取消的工作編號
+
+
+class Node:
+    __slots__ = ('move', 'value', 'parent', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move, value, parent):
+        self.move = move        # 到達此節點的落子
+        self.value = value      # 下這一手的一方
+        self.parent = parent
+        self.children = []
+        self.untried = None     # 尚未展開的落子，第一次經過時才產生
+        self.visits = 0
+        self.wins = 0.0         # 以 value 一方計的勝場（和局或估計值可為小數）
+        self.terminal = False   # 這一手連成五子
+
+    def select(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+
+class Tree:
+    """單一行程內的一棵搜尋樹，在自己的 BitBoard 上落子、模擬後還原"""
+
+    def __init__(self, line_points, stones, value, seed=None):
+        """
+        :param stones: 棋盤上已有的 [(x, y, 顏色值)]
+        :param value: 輪到下的一方
+        """
+        self._board = BitBoard(line_points)
+        for x, y, stone in stones:
+            self._board.place(x, y, stone)
+        self._scorers = {BLACK_CHESSMAN.Value: AI(line_points, BLACK_CHESSMAN, self._board),
+                         WHITE_CHESSMAN.Value: AI(line_points, WHITE_CHESSMAN, self._board)}
+        self._random = random.Random(seed)
+        self.root = Node(None, 3 - value, None)
+        self.playouts = 0
+
+    def run(self, deadline, max_playouts=None, cancelled=None):
+        """反覆模擬直到 deadline（perf_counter 時間）、達到 max_playouts 次或 cancelled() 為真"""
+        while time.perf_counter() < deadline:
+            if max_playouts is not None and self.playouts >= max_playouts:
+                break
+            if cancelled is not None and cancelled():
+                break
+            self.playout()
+
+    def root_stats(self):
+        """:return: {(x, y): (visits, wins)}，wins 以根節點輪到的一方計"""
+        return {(child.move.X, child.move.Y): (child.visits, child.wins) for child in self.root.children}
+
+    def playout(self):
+        board = self._board
+        placed = []
+        node = self.root
+        try:
+            # 選擇：走到還有未展開落子或已分勝負的節點
+            while not node.terminal:
+                if node.untried is None:
+                    node.untried = self._expand_moves(3 - node.value)
+                if node.untried or not node.children:
+                    break
+                node = node.select(EXPLORATION)
+                board.place(node.move.X, node.move.Y, node.value)
+                placed.append(node.move)
+
+            # 展開
+            if not node.terminal and node.untried:
+                point = node.untried.pop(0)
+                child = Node(point, 3 - node.value, node)
+                node.children.append(child)
+                board.place(point.X, point.Y, child.value)
+                placed.append(point)
+                child.terminal = board.is_five(point.X, point.Y)
+                node = child
+
+            # 模擬：回傳 node.value 一方的勝率
+            if node.terminal:
+                result = 1.0
+            elif not node.untried and not node.children and node.untried is not None:
+                result = 0.5    # 棋盤已滿
+            else:
+                result = self._simulate(node.value, placed)
+        finally:
+            for point in reversed(placed):
+                board.remove(point.X, point.Y)
+
+        # 回溯
+        self.playouts += 1
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+
+    def _expand_moves(self, value):
+        moves = self._scorers[value].get_candidates()[:EXPAND_WIDTH]
+        if not moves and self._board.count == 0:
+            center = self._board.line_points // 2
+            return [Point(center, center)]
+        return [point for _, point in moves]
+
+    def _simulate(self, last, placed):
+        """
+        從 last 一方剛下完的局面依棋型評分輪流落子，新落的子加進 placed 以便還原
+        :return: last 一方的勝率
+        """
+        board = self._board
+        value = 3 - last
+        for _ in range(PLAYOUT_DEPTH):
+            moves = self._scorers[value].get_candidates()
+            if not moves:
+                return 0.5
+            # 下評分最高的點，同分時隨機選一個
+            best = moves[0][0]
+            ties = 1
+            while ties < len(moves) and moves[ties][0] == best:
+                ties += 1
+            point = moves[self._random.randrange(ties)][1]
+            board.place(point.X, point.Y, value)
+            placed.append(point)
+            if board.is_five(point.X, point.Y):
+                return 1.0 if value == last else 0.0
+            value = 3 - value
+        # 以輪到的一方 value 的視角估計
+        score = evaluate(board, value)
+        if score > WIN_BOUND:
+            win = 1.0
+        else:
+            win = 1.0 / (1.0 + math.exp(-score / EVAL_SCALE))
+        return win if value == last else 1.0 - win
+
+
+def _init_worker(cancelled_job):
+    global _cancelled_job
+    _cancelled_job = cancelled_job
+
+
+def search_tree(line_points, stones, value, time_limit, seed=None, max_playouts=None, job=None):
+    """
+    行程池的工作：建一棵樹搜尋 time_limit 秒
+    :param job: 工作編號，主行程取消這個編號時提早結束
+    :return: (根節點統計, 模擬次數)
+    """
+    tree = Tree(line_points, stones, value, seed)
+    cancelled = None
+    if _cancelled_job is not None and job is not None:
+        cancelled = lambda: _cancelled_job.value == job
+    tree.run(time.perf_counter() + time_limit, max_playouts, cancelled)
+    return tree.root_stats(), tree.playouts
+
+
+class MCTSAI(AI):
+    """
+    與 AI 介面相同（get_opponent_drop / AI_drop）。
+    workers 為 1 時在目前的執行緒搜尋，大於 1 時分給行程池，各行程的樹在時間到時合併
+    """
+
+    def __init__(self, line_points, chessman, checkerboard=None, time_limit=DEFAULT_TIME, workers=1,
+                 max_playouts=None):
+        """
+        :param time_limit: 每步秒數
+        :param workers: 平行搜尋的行程數
+        :param max_playouts: 每個行程每步最多模擬次數，None 表示只受時間限制
+        """
+        super().__init__(line_points, chessman, checkerboard)
+        self.time_limit = time_limit
+        self.workers = workers
+        self.max_playouts = max_playouts
+        self.stats = {}
+        self._pool = None
+        self._job = 0
+        self._cancelled_job = -1
+        self._shared_cancelled_job = None   # 行程池各行程看得到的 _cancelled_job
+
+    def AI_drop(self):
+        point = self.search()
+        if not self._shared:
+            self._board.place(point.X, point.Y, self._my.Value)
+        return point
+
+    def cancel(self):
+        """要求進行中的搜尋盡快結束，可從其他執行緒呼叫"""
+        self._cancelled_job = self._job
+        if self._shared_cancelled_job is not None:
+            self._shared_cancelled_job.value = self._job
+
+    def close(self):
+        """結束行程池，進行中的搜尋一併取消"""
+        if self._pool is not None:
+            self.cancel()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._shared_cancelled_job = None
+
+    def search(self):
+        """
+        :return: 落子位置 Point
+        """
+        self._job += 1
+        job = self._job
+        start = time.perf_counter()
+        if self._board.count == 0:
+            center = self._line_points // 2
+            return Point(center, center)
+
+        stones = [(x, y, cell) for y, row in enumerate(self._checkerboard)
+                  for x, cell in enumerate(row) if cell]
+        value = self._my.Value
+        if self.workers > 1:
+            if self._pool is None:
+                # 以 spawn 啟動，避免在有 pygame 與其他執行緒的行程中 fork
+                context = multiprocessing.get_context('spawn')
+                self._shared_cancelled_job = context.RawValue('q', -1)
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                                 initargs=(self._shared_cancelled_job,))
+            seed = random.getrandbits(32)
+            futures = [self._pool.submit(search_tree, self._line_points, stones, value, self.time_limit,
+                                         seed + i, self.max_playouts, job)
+                       for i in range(self.workers)]
+            # 等待時定期檢查是否被取消：取消時各行程也會提早結束，不必等到時間用完
+            pending = futures
+            while pending and self._cancelled_job != job:
+                _, pending = wait(pending, timeout=CANCEL_POLL)
+            if self._cancelled_job == job:
+                for future in futures:
+                    future.cancel()
+                results = []
+            else:
+                results = [future.result() for future in futures]
+        else:
+            tree = Tree(self._line_points, stones, value, random.getrandbits(32))
+            tree.run(start + self.time_limit, self.max_playouts, lambda: self._cancelled_job == job)
+            results = [(tree.root_stats(), tree.playouts)]
+
+        # 合併各棵樹的根節點統計，選訪問次數最多的點
+        merged = {}
+        playouts = 0
+        for root_stats, count in results:
+            playouts += count
+            for move, (visits, wins) in root_stats.items():
+                total = merged.setdefault(move, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        if not merged:
+            # 還沒模擬就被取消
+            return self.get_candidates()[0][1]
+        (x, y), (visits, wins) = max(merged.items(), key=lambda item: (item[1][0], item[1][1]))
+
+        elapsed = time.perf_counter() - start
+        self.stats = {'playouts': playouts, 'nodes': playouts, 'time': elapsed,
+                      'playouts_per_second': playouts / elapsed if elapsed else 0.0,
+                      'workers': self.workers, 'win_rate': wins / visits}
+        return Point(x, y)
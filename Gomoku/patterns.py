@@ -0,0 +1,112 @@
+"""
+棋型查表：把經過某點的一條線（左右各 RADIUS 格）從 BitBoard 的遮罩取出編成整數，
+一次查表即得到該方向的分數。表在 import 時建立一次，並快取在磁碟上
+"""
+
+import os
+import pickle
+from functools import lru_cache
+
+RADIUS = 5                      # 與 AI._get_direction_score 的掃描距離相同
+WINDOW_BITS = 2 * RADIUS + 1    # 含中心點的視窗寬度
+WINDOW_MASK = (1 << WINDOW_BITS) - 1
+TABLE_VERSION = 1               # 評分規則改變時遞增，使舊的磁碟快取失效
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pattern_table.pickle')
+
+
+def make_key(left, right, mine, theirs):
+    """
+    :param left: 中心往負方向在棋盤內的格數（最多 RADIUS）
+    :param right: 中心往正方向在棋盤內的格數（最多 RADIUS）
+    :param mine: 己方棋子的視窗位元，第 RADIUS 位為中心
+    :param theirs: 對方棋子的視窗位元
+    """
+    return ((left * (RADIUS + 1) + right) << (2 * WINDOW_BITS)) | (mine << WINDOW_BITS) | theirs
+
+
+def windows():
+    """
+    列舉所有中心為空的視窗
+    :return: 逐一產生 (left, right, cells)，cells[RADIUS + d] 為偏移 d 處的 0 空 / 1 己方 / 2 對方
+    """
+    for left in range(RADIUS + 1):
+        for right in range(RADIUS + 1):
+            positions = [RADIUS + d for d in range(-left, right + 1) if d != 0]
+            for code in range(3 ** len(positions)):
+                cells = [0] * WINDOW_BITS
+                for pos in positions:
+                    code, cells[pos] = divmod(code, 3)
+                yield left, right, cells
+
+
+def build_table(direction_score):
+    """
+    :param direction_score: direction_score(left, right, cells) 回傳該視窗的分數
+    :return: {key: 分數}
+    """
+    table = {}
+    for left, right, cells in windows():
+        mine = theirs = 0
+        for pos, cell in enumerate(cells):
+            if cell == 1:
+                mine |= 1 << pos
+            elif cell == 2:
+                theirs |= 1 << pos
+        table[make_key(left, right, mine, theirs)] = direction_score(left, right, cells)
+    return table
+
+
+def load_table(direction_score, path=CACHE_PATH):
+    """從磁碟讀取查表，不存在或版本不符時重建並寫回"""
+    try:
+        with open(path, 'rb') as f:
+            version, table = pickle.load(f)
+        if version == TABLE_VERSION:
+            return table
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+    table = build_table(direction_score)
+    try:
+        with open(path, 'wb') as f:
+            pickle.dump((TABLE_VERSION, table), f, pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass    # 目錄不可寫時只用記憶體中的表
+    return table
+
+
+@lru_cache(maxsize=None)
+def _point_keys(line_points):
+    """
+    每個點在四個方向上的 (方向, 線索引, 位置, 邊界部分的 key)，方向順序同 board.offset
+    """
+    n = line_points
+    keys = []
+    for y in range(n):
+        row = []
+        for x in range(n):
+            lines = ((y, x, 0, n - 1),
+                     (x, y, 0, n - 1),
+                     (x - y + n - 1, x, max(0, x - y), min(n - 1, n - 1 + x - y)),
+                     (x + y, x, max(0, x + y - n + 1), min(n - 1, x + y)))
+            point = []
+            for k, (i, pos, lo, hi) in enumerate(lines):
+                wall = make_key(min(RADIUS, pos - lo), min(RADIUS, hi - pos), 0, 0)
+                point.append((k, i, pos, wall))
+            row.append(tuple(point))
+        keys.append(tuple(row))
+    return tuple(keys)
+
+
+def point_score(table, board, value, x, y):
+    """
+    以查表計算 value 一方在空點 (x, y) 的分數，等同四個方向 AI._get_direction_score 之和
+    """
+    mine_lines = board.masks(value)
+    their_lines = board.masks(3 - value)
+    score = 0
+    for k, i, pos, wall in _point_keys(board.line_points)[y][x]:
+        # 左移 RADIUS 位讓靠近邊界的視窗不必處理負數位移
+        mine = ((mine_lines[k][i] << RADIUS) >> pos) & WINDOW_MASK
+        theirs = ((their_lines[k][i] << RADIUS) >> pos) & WINDOW_MASK
+        score += table[wall | (mine << WINDOW_BITS) | theirs]
+    return score
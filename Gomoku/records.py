@@ -0,0 +1,180 @@
+"""
+對局記錄：每局一行 JSON 追加在記錄檔尾端，另有兩個小索引
+    games.idx           每局在記錄檔中的起始位置（8 位元組），可直接跳到第 i 局
+    games.summary.json  累計的勝負與步數，啟動時讀這個檔即得到生涯勝率，不必重讀所有對局
+索引遺失或與記錄檔不一致時（例如寫到一半被中斷），會掃描記錄檔重建
+
+    python records.py        # 顯示累計統計
+    python records.py 3      # 逐手列出第 3 局（從 0 起算）
+"""
+
+import json
+import os
+import struct
+import sys
+from board import Point
+
+RECORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'records')
+LOG_NAME = 'games.log'
+INDEX_NAME = 'games.idx'
+SUMMARY_NAME = 'games.summary.json'
+SUMMARY_VERSION = 1
+
+_OFFSET = struct.Struct('<Q')
+
+
+def _empty_summary():
+    return {'version': SUMMARY_VERSION, 'games': 0, 'black_wins': 0, 'white_wins': 0, 'draws': 0,
+            'total_moves': 0, 'total_duration': 0.0, 'log_size': 0}
+
+
+class GameLog:
+    """只追加的對局記錄檔"""
+
+    def __init__(self, directory=RECORDS_DIR):
+        self._directory = directory
+        self._log_path = os.path.join(directory, LOG_NAME)
+        self._index_path = os.path.join(directory, INDEX_NAME)
+        self._summary_path = os.path.join(directory, SUMMARY_NAME)
+        self.summary = self._load_summary()
+
+    def __len__(self):
+        return self.summary['games']
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def append(self, moves, winner, duration):
+        """
+        :param moves: 依序的落子 [Point]，黑方先下
+        :param winner: 'black' / 'white' / None（和局或未分勝負）
+        :param duration: 對局秒數
+        :return: 這一局的編號
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        record = {'moves': [[point.X, point.Y] for point in moves], 'winner': winner, 'duration': round(duration, 3)}
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+        summary = self.summary
+        with open(self._log_path, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+        with open(self._index_path, 'ab') as f:
+            f.write(_OFFSET.pack(offset))
+        _count(summary, record)
+        summary['log_size'] = offset + len(line)
+        self._write_summary()
+        return summary['games'] - 1
+
+    def read(self, number):
+        """
+        :return: 第 number 局的記錄 {'moves': [[x, y], ...], 'winner': ..., 'duration': ...}
+        """
+        if not 0 <= number < len(self):
+            raise IndexError(f'沒有第 {number} 局')
+        with open(self._index_path, 'rb') as f:
+            f.seek(number * _OFFSET.size)
+            offset, = _OFFSET.unpack(f.read(_OFFSET.size))
+        with open(self._log_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def replay(self, number):
+        """逐手產生第 number 局的落子 Point"""
+        for x, y in self.read(number)['moves']:
+            yield Point(x, y)
+
+    def __iter__(self):
+        """依序產生所有對局記錄，一次只讀一行"""
+        try:
+            f = open(self._log_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if line.endswith(b'\n'):
+                    yield json.loads(line)
+
+    def _load_summary(self):
+        try:
+            with open(self._summary_path, encoding='utf-8') as f:
+                summary = json.load(f)
+            if (summary.get('version') == SUMMARY_VERSION
+                    and summary['log_size'] == _file_size(self._log_path)
+                    and summary['games'] * _OFFSET.size == _file_size(self._index_path)):
+                return summary
+        except (OSError, ValueError, KeyError):
+            pass
+        return self._rebuild()
+
+    def _rebuild(self):
+        """掃描記錄檔重建索引與統計；最後一行不完整時截掉"""
+        summary = _empty_summary()
+        offsets = bytearray()
+        size = 0
+        try:
+            with open(self._log_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    offsets += _OFFSET.pack(size)
+                    size += len(line)
+                    _count(summary, record)
+        except FileNotFoundError:
+            return summary
+        with open(self._log_path, 'r+b') as f:
+            f.truncate(size)
+        with open(self._index_path, 'wb') as f:
+            f.write(offsets)
+        summary['log_size'] = size
+        self.summary = summary
+        self._write_summary()
+        return summary
+
+    def _write_summary(self):
+        # 先寫暫存檔再改名，中斷時不會留下寫了一半的統計
+        temp = self._summary_path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f)
+        os.replace(temp, self._summary_path)
+
+
+def _count(summary, record):
+    summary['games'] += 1
+    if record['winner'] == 'black':
+        summary['black_wins'] += 1
+    elif record['winner'] == 'white':
+        summary['white_wins'] += 1
+    else:
+        summary['draws'] += 1
+    summary['total_moves'] += len(record['moves'])
+    summary['total_duration'] += record['duration']
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def main():
+    log = GameLog()
+    if len(sys.argv) > 1:
+        number = int(sys.argv[1])
+        record = log.read(number)
+        for i, point in enumerate(log.replay(number)):
+            print(f"{i + 1:3d} {'黑' if i % 2 == 0 else '白'} ({point.X}, {point.Y})")
+        print(f"勝方：{record['winner'] or '無'}，{record['duration']:.1f} 秒")
+        return
+    summary = log.summary
+    print(f"共 {summary['games']} 局：黑勝 {summary['black_wins']}，白勝 {summary['white_wins']}，"
+          f"其他 {summary['draws']}，平均 {summary['total_moves'] / max(summary['games'], 1):.1f} 手")
+
+
+if __name__ == '__main__':
+    main()
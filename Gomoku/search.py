@@ -0,0 +1,297 @@
+"""五子棋搜尋引擎：negamax + alpha-beta 剪枝 + 迭代加深，在時間或節點預算內回傳最佳落子"""
+
+import time
+from collections import namedtuple
+from board import Point
+from ai import AI
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+import threats
+
+# 每步的搜尋預算：秒數、節點數（None 表示不限）與最大深度
+Budget = namedtuple('Budget', 'time_limit max_nodes max_depth')
+
+# 難度即預算
+LEVELS = {
+    'easy': Budget(0.3, 2000, 2),
+    'normal': Budget(1.0, 20000, 4),
+    'hard': Budget(3.0, None, 8),
+}
+DEFAULT_LEVEL = 'normal'
+
+WIN_SCORE = 1000000     # 連成五子的分數，減去步數使較快的勝利分數較高
+WIN_BOUND = WIN_SCORE - 1000    # 超過此值即為必勝/必敗的分數
+BRANCH_WIDTH = 10       # 每個節點只展開評分最高的幾手
+PONDER_REPLIES = 5      # 預想時搜尋對方最可能的幾種應手
+
+# 靜態評估：每個不含對方棋子的五格視窗，依其中己方子數計分
+WINDOW_SCORES = (0, 1, 10, 100, 1000)
+TEMPO = 1.5             # 輪到下的一方威脅較有價值
+_POPCOUNT = [bin(i).count('1') for i in range(32)]
+
+
+class SearchTimeout(Exception):
+    """本步預算用盡或搜尋被取消"""
+
+
+def _to_table(score, ply):
+    """勝負分數含步數，存入置換表時改為相對於該局面"""
+    if score > WIN_BOUND:
+        return score + ply
+    if score < -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    if score > WIN_BOUND:
+        return score - ply
+    if score < -WIN_BOUND:
+        return score + ply
+    return score
+
+
+def evaluate(board, value, ply=0):
+    """
+    靜態評估（value 一方的視角）：掃描每條有子的線上所有五格視窗，
+    輪到的一方若已有四子視窗即可在下一手連五
+    """
+    scores = [0, 0, 0]
+    fours = [False, False, False]
+    for black, white, lo, hi in board.lines():
+        for shift in range(lo, hi - 3):
+            b = (black >> shift) & 31
+            w = (white >> shift) & 31
+            if b and not w:
+                k = _POPCOUNT[b]
+                scores[1] += WINDOW_SCORES[k]
+                fours[1] = fours[1] or k == 4
+            elif w and not b:
+                k = _POPCOUNT[w]
+                scores[2] += WINDOW_SCORES[k]
+                fours[2] = fours[2] or k == 4
+    if fours[value]:
+        return WIN_SCORE - ply
+    return int(scores[value] * TEMPO) - scores[3 - value]
+
+
+class SearchAI(AI):
+    """
+    與 AI 介面相同（get_opponent_drop / AI_drop），
+    以 AI 的棋型評分排序候選點，向下搜尋數層
+    """
+
+    def __init__(self, line_points, chessman, checkerboard=None, level=DEFAULT_LEVEL, table_bits=16,
+                 vectorized=False, threat_nodes=threats.DEFAULT_NODES):
+        """
+        :param level: LEVELS 中的難度名稱，或自訂的 Budget
+        :param table_bits: 置換表槽位數為 2 ** table_bits
+        :param vectorized: 著法排序改用 threatmap 一次評分整個棋盤
+        :param threat_nodes: 每步先以威脅空間搜尋（threats）找必勝的節點預算，0 為不使用
+        """
+        super().__init__(line_points, chessman, checkerboard, vectorized)
+        # 以對方視角評分的 AI，與自己共用棋盤
+        self._rival = AI(line_points, self._opponent, self._board, vectorized)
+        self.budget = LEVELS[level] if isinstance(level, str) else level
+        self.table = TranspositionTable(table_bits)
+        self.threat_nodes = threat_nodes
+        self.stats = {}
+        self._root_best = None
+        self._deadline = None
+        self._nodes = 0
+        # 每次 search() / ponder() 為一個工作；cancel() 只取消當時進行中的工作
+        self._job = 0
+        self._cancelled_job = -1
+        # 預想結果：{對方應手後的局面雜湊: (落子, stats)}，None 表示這一手沒有預想
+        self._ponder = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    def AI_drop(self):
+        start = time.perf_counter()
+        entry = self._ponder.get(self._board.hash) if self._ponder is not None else None
+        if entry is not None:
+            point, stats = entry
+            self.ponder_hits += 1
+            self.stats = dict(stats, time=time.perf_counter() - start, ponder_hit=True)
+        else:
+            if self._ponder is not None:
+                self.ponder_misses += 1
+            point = self.search()
+        self._ponder = None
+        if not self._shared:
+            self._board.place(point.X, point.Y, self._my.Value)
+        return point
+
+    def cancel(self):
+        """
+        要求進行中的搜尋或預想盡快結束，可從其他執行緒呼叫；
+        被取消的搜尋照常回傳目前的最佳點
+        """
+        self._cancelled_job = self._job
+
+    @property
+    def ponder_hit_rate(self):
+        total = self.ponder_hits + self.ponder_misses
+        return self.ponder_hits / total if total else 0.0
+
+    def ponder(self, replies=PONDER_REPLIES):
+        """
+        輪到對方時預先思考：對其評分最高的幾種應手各搜尋一次，
+        對方真的下了其中一手時 AI_drop 直接取用結果。可用 cancel() 中止
+        """
+        self._job += 1
+        job = self._job
+        self._ponder = {}
+        for _, reply in self._rival.get_candidates()[:replies]:
+            if self._cancelled_job == job:
+                break
+            self._board.place(reply.X, reply.Y, self._opponent.Value)
+            try:
+                if self._board.is_five(reply.X, reply.Y):
+                    continue
+                point = self._search()
+                # 被取消的搜尋不完整，不留給 AI_drop
+                if self._cancelled_job != job:
+                    self._ponder[self._board.hash] = (point, self.stats)
+            finally:
+                self._board.remove(reply.X, reply.Y)
+
+    def search(self):
+        """
+        迭代加深搜尋，預算用盡時回傳目前找到的最佳點
+        :return: 落子位置 Point
+        """
+        self._job += 1
+        return self._search()
+
+    def _search(self):
+        start = time.perf_counter()
+        budget = self.budget
+        self._deadline = start + budget.time_limit if budget.time_limit else None
+        self._nodes = 0
+        self.table.new_search()
+        hits, misses = self.table.hits, self.table.misses
+        if self._board.count == 0:
+            center = self._line_points // 2
+            return Point(center, center)
+
+        # 先找連續衝四、活三的必勝，找到就不必全寬搜尋。
+        # 每個節點都經過 _tick，與全寬搜尋共用本步的時間、節點預算與取消
+        if self.threat_nodes:
+            solver = threats.ThreatSolver(self._board, self.threat_nodes, self._tick)
+            try:
+                sequence = solver.solve(self._my.Value)
+            except SearchTimeout:
+                sequence = None     # 預算已用盡，下面的搜尋會立刻結束並回傳評分最高的點
+            if sequence is not None:
+                self.stats = {'depth': 0, 'nodes': self._nodes, 'time': time.perf_counter() - start,
+                              'score': WIN_SCORE - len(sequence), 'tt_hits': 0, 'tt_misses': 0,
+                              'threat_sequence': sequence}
+                return sequence[0]
+
+        moves = self._ordered_moves(self._my.Value)
+        best, score, depth = moves[0][1], moves[0][0], 0
+        if len(moves) > 1:
+            for d in range(1, budget.max_depth + 1):
+                try:
+                    best, score = self._search_root(d, best)
+                    depth = d
+                except SearchTimeout:
+                    # 上一輪的最佳點最先搜尋，因此本輪已完成的部分結果不會比它差
+                    if self._root_best is not None:
+                        best, score = self._root_best
+                    break
+                if abs(score) > WIN_BOUND:
+                    break
+
+        elapsed = time.perf_counter() - start
+        self.stats = {'depth': depth, 'nodes': self._nodes, 'time': elapsed, 'score': score,
+                      'tt_hits': self.table.hits - hits, 'tt_misses': self.table.misses - misses}
+        return best
+
+    def _search_root(self, depth, pv):
+        self._root_best = None
+        value = self._my.Value
+        moves = self._ordered_moves(value)[:BRANCH_WIDTH]
+        moves.sort(key=lambda m: m[1] != pv)
+        alpha, beta = -WIN_SCORE, WIN_SCORE
+        for _, point in moves:
+            score = self._try(point, value, depth, alpha, beta, 1)
+            if self._root_best is None or score > alpha:
+                alpha = score
+                self._root_best = (point, score)
+        return self._root_best
+
+    def _negamax(self, depth, alpha, beta, value, ply):
+        self._tick()
+        key = self._board.hash
+        entry = self.table.probe(key)
+        tt_move = None
+        if entry is not None:
+            if entry.depth >= depth:
+                score = _from_table(entry.score, ply)
+                if entry.flag == EXACT:
+                    return score
+                if entry.flag == LOWER and score >= beta:
+                    return score
+                if entry.flag == UPPER and score <= alpha:
+                    return score
+            tt_move = entry.move
+        if depth == 0:
+            score = self._evaluate(value, ply)
+            self.table.store(key, 0, EXACT, _to_table(score, ply), None)
+            return score
+        moves = self._ordered_moves(value)[:BRANCH_WIDTH]
+        if not moves:
+            return 0
+        if tt_move is not None:
+            moves.sort(key=lambda m: m[1] != tt_move)
+        alpha_orig = alpha
+        best = -WIN_SCORE
+        best_move = None
+        for _, point in moves:
+            score = self._try(point, value, depth, alpha, beta, ply)
+            if score > best:
+                best = score
+                best_move = point
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, depth, flag, _to_table(best, ply), best_move)
+        return best
+
+    def _try(self, point, value, depth, alpha, beta, ply):
+        """落子、往下搜尋，再還原棋盤"""
+        self._board.place(point.X, point.Y, value)
+        try:
+            if self._board.is_five(point.X, point.Y):
+                return WIN_SCORE - ply
+            return -self._negamax(depth - 1, -beta, -alpha, 3 - value, ply + 1)
+        finally:
+            self._board.remove(point.X, point.Y)
+
+    def _evaluate(self, value, ply):
+        return evaluate(self._board, value, ply)
+
+    def _tick(self):
+        self._nodes += 1
+        if self._cancelled_job == self._job:
+            raise SearchTimeout()
+        if self.budget.max_nodes is not None and self._nodes > self.budget.max_nodes:
+            raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+    def _scorer(self, value):
+        return self if value == self._my.Value else self._rival
+
+    def _ordered_moves(self, value):
+        """棋盤候選點依 value 一方的棋型評分由高到低排序，回傳 [(分數, Point)]"""
+        return self._scorer(value).get_candidates()
@@ -0,0 +1,341 @@
+"""
+五子棋對局伺服器：以 asyncio 同時進行多局，客戶端經 TCP 或 Unix socket 以一行一個 JSON 溝通。
+電腦的落子交給行程池計算，慢的搜尋不會卡住其他對局
+
+    python server.py --port 5555 --jobs 4
+    python server.py --unix /tmp/gomoku.sock
+
+客戶端 -> 伺服器
+    {"op": "new", "engine": "search:easy", "color": "black"}   與電腦對下，color 為自己執的顏色
+    {"op": "join", "room": "abc"}                              與他人對下，先進房者執黑
+    {"op": "move", "x": 9, "y": 9}
+    {"op": "resign"}
+    {"op": "stats"}
+伺服器 -> 客戶端
+    {"op": "started", "game": 1, "color": "black", "line_points": 19}
+    {"op": "move", "game": 1, "color": "white", "x": 9, "y": 10}
+    {"op": "end", "game": 1, "winner": "black", "reason": "five"}   winner 可為 null（和局）
+    {"op": "stats", ...}
+    {"op": "error", "message": "..."}
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, Checkerboard
+from engines import create_engine
+
+LINE_POINTS = 19
+DEFAULT_ENGINE = 'search:easy'
+LATENCY_SAMPLES = 1000  # 計算延遲百分位數時保留的最近樣本數
+
+_COLORS = {'black': BLACK_CHESSMAN, 'white': WHITE_CHESSMAN}
+_NAMES = {BLACK_CHESSMAN: 'black', WHITE_CHESSMAN: 'white'}
+
+
+def ai_move(engine_spec, line_points, moves):
+    """
+    行程池的工作：依落子記錄重建棋盤，讓輪到的一方的 AI 落子
+    :param moves: [(x, y)]，黑方先下
+    :return: ((x, y), 搜尋節點數)
+    """
+    checkerboard = Checkerboard(line_points, verbose=False)
+    for i, (x, y) in enumerate(moves):
+        checkerboard.board.place(x, y, BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value)
+    chessman = BLACK_CHESSMAN if len(moves) % 2 == 0 else WHITE_CHESSMAN
+    engine = create_engine(engine_spec, line_points, chessman, checkerboard)
+    try:
+        point = engine.AI_drop()
+    finally:
+        close = getattr(engine, 'close', None)
+        if close is not None:
+            close()
+    return (point.X, point.Y), getattr(engine, 'stats', {}).get('nodes', 0)
+
+
+class Game:
+    def __init__(self, number, line_points):
+        self.number = number
+        self.checkerboard = Checkerboard(line_points, verbose=False)
+        self.players = {}       # Chessman -> Client 或電腦的 AI 名稱（str）
+        self.turn = BLACK_CHESSMAN
+        self.over = False
+        self.started = time.perf_counter()
+        self.latencies = []     # 每次收到玩家落子到輪回玩家（含電腦應手）的秒數
+
+    def stats(self):
+        latencies = self.latencies
+        return {'game': self.number, 'moves': len(self.checkerboard.moves),
+                'avg_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+                'max_latency': max(latencies, default=0.0)}
+
+
+class Client:
+    """一個連線，同時只參與一局"""
+
+    def __init__(self, writer):
+        self._writer = writer
+        self.game = None
+        self.color = None
+
+    async def send(self, message):
+        if self._writer.is_closing():
+            return
+        self._writer.write((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+
+
+class MatchServer:
+    def __init__(self, jobs=None, line_points=LINE_POINTS):
+        """
+        :param jobs: 計算電腦落子的行程數，None 為 CPU 核心數
+        """
+        self.line_points = line_points
+        self._executor = ProcessPoolExecutor(max_workers=jobs)
+        self._games = {}
+        self._rooms = {}        # 房名 -> 等待對手的 Game
+        self._next_game = 1
+        self._started = time.perf_counter()
+        self._moves = 0
+        self._finished = 0
+        self._ai_moves = 0
+        self._ai_nodes = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    async def serve_tcp(self, host, port):
+        server = await asyncio.start_server(self._handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path):
+        server = await asyncio.start_unix_server(self._handle, path)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """伺服器整體統計與進行中各局的延遲"""
+        uptime = time.perf_counter() - self._started
+        latencies = sorted(self._latencies)
+        return {
+            'uptime': uptime,
+            'games_active': len(self._games),
+            'games_finished': self._finished,
+            'moves': self._moves,
+            'moves_per_second': self._moves / uptime if uptime else 0.0,
+            'ai_moves': self._ai_moves,
+            'ai_nodes': self._ai_nodes,
+            'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            'games': [game.stats() for game in self._games.values()],
+        }
+
+    async def _handle(self, reader, writer):
+        client = Client(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    op = message['op']
+                except (ValueError, KeyError, TypeError):
+                    await client.send({'op': 'error', 'message': '無法解析的訊息'})
+                    continue
+                handler = getattr(self, '_op_' + str(op), None)
+                if handler is None:
+                    await client.send({'op': 'error', 'message': f'未知的指令：{op}'})
+                    continue
+                await handler(client, message)
+        except ConnectionError:
+            pass
+        finally:
+            game = client.game
+            if game is not None and not game.over:
+                if len(game.players) < 2:
+                    # 還在等對手，直接收掉房間
+                    game.over = True
+                    self._games.pop(game.number, None)
+                else:
+                    await self._end(game, _other(client.color), 'disconnect')
+            writer.close()
+
+    async def _op_new(self, client, message):
+        if client.game is not None and not client.game.over:
+            await client.send({'op': 'error', 'message': '對局進行中'})
+            return
+        spec = message.get('engine', DEFAULT_ENGINE)
+        color = _COLORS.get(message.get('color', 'black'))
+        if color is None:
+            await client.send({'op': 'error', 'message': 'color 須為 black 或 white'})
+            return
+        try:
+            create_engine(spec, self.line_points, _other(color))
+        except ValueError as e:
+            await client.send({'op': 'error', 'message': str(e)})
+            return
+        game = self._new_game()
+        game.players = {color: client, _other(color): spec}
+        self._seat(client, game, color)
+        await self._started_game(game)
+        await self._ai_turn(game)
+
+    async def _op_join(self, client, message):
+        if client.game is not None and not client.game.over:
+            await client.send({'op': 'error', 'message': '對局進行中'})
+            return
+        room = str(message.get('room', ''))
+        game = self._rooms.pop(room, None)
+        if game is None or game.over:
+            game = self._new_game()
+            game.players[BLACK_CHESSMAN] = client
+            self._seat(client, game, BLACK_CHESSMAN)
+            self._rooms[room] = game
+            return
+        game.players[WHITE_CHESSMAN] = client
+        self._seat(client, game, WHITE_CHESSMAN)
+        await self._started_game(game)
+
+    async def _op_move(self, client, message):
+        game = client.game
+        received = time.perf_counter()
+        if game is None or game.over or len(game.players) < 2:
+            await client.send({'op': 'error', 'message': '沒有進行中的對局'})
+            return
+        if game.turn != client.color:
+            await client.send({'op': 'error', 'message': '還沒輪到你'})
+            return
+        try:
+            point = Point(int(message['x']), int(message['y']))
+        except (KeyError, TypeError, ValueError):
+            await client.send({'op': 'error', 'message': 'move 需要整數 x、y'})
+            return
+        n = self.line_points
+        if not (0 <= point.X < n and 0 <= point.Y < n) or not game.checkerboard.can_drop(point):
+            await client.send({'op': 'error', 'message': '不能下在這裡'})
+            return
+        await self._drop(game, point)
+        await self._ai_turn(game)
+        game.latencies.append(time.perf_counter() - received)
+        self._latencies.append(game.latencies[-1])
+
+    async def _op_resign(self, client, message):
+        game = client.game
+        if game is None or game.over:
+            await client.send({'op': 'error', 'message': '沒有進行中的對局'})
+            return
+        await self._end(game, _other(client.color), 'resign')
+
+    async def _op_stats(self, client, message):
+        await client.send(dict(self.stats(), op='stats'))
+
+    def _new_game(self):
+        game = Game(self._next_game, self.line_points)
+        self._next_game += 1
+        self._games[game.number] = game
+        return game
+
+    @staticmethod
+    def _seat(client, game, color):
+        client.game = game
+        client.color = color
+
+    async def _started_game(self, game):
+        for color, player in game.players.items():
+            if isinstance(player, Client):
+                await player.send({'op': 'started', 'game': game.number, 'color': _NAMES[color],
+                                   'line_points': self.line_points})
+
+    async def _ai_turn(self, game):
+        """輪到電腦時在行程池計算落子"""
+        spec = game.players.get(game.turn)
+        if game.over or not isinstance(spec, str):
+            return
+        moves = [tuple(point) for point in game.checkerboard.moves]
+        loop = asyncio.get_running_loop()
+        (x, y), nodes = await loop.run_in_executor(self._executor, ai_move, spec, self.line_points, moves)
+        self._ai_moves += 1
+        self._ai_nodes += nodes
+        if not game.over:   # 計算期間玩家可能已離線或投降
+            await self._drop(game, Point(x, y))
+
+    async def _drop(self, game, point):
+        color = game.turn
+        winner = game.checkerboard.drop(color, point)
+        self._moves += 1
+        game.turn = _other(color)
+        await self._broadcast(game, {'op': 'move', 'game': game.number, 'color': _NAMES[color],
+                                     'x': point.X, 'y': point.Y})
+        if winner is not None:
+            await self._end(game, winner, 'five')
+        elif len(game.checkerboard.moves) == self.line_points ** 2:
+            await self._end(game, None, 'draw')
+
+    async def _end(self, game, winner, reason):
+        game.over = True
+        self._games.pop(game.number, None)
+        self._finished += 1
+        await self._broadcast(game, {'op': 'end', 'game': game.number, 'winner': _NAMES.get(winner),
+                                     'reason': reason})
+
+    @staticmethod
+    async def _broadcast(game, message):
+        for player in game.players.values():
+            if isinstance(player, Client):
+                await player.send(message)
+
+
+def _other(color):
+    return WHITE_CHESSMAN if color == BLACK_CHESSMAN else BLACK_CHESSMAN
+
+
+async def _report(server, interval):
+    while True:
+        await asyncio.sleep(interval)
+        stats = server.stats()
+        print(f"進行中 {stats['games_active']} 局，已結束 {stats['games_finished']} 局，"
+              f"{stats['moves_per_second']:.1f} 手/秒，延遲平均 {stats['latency_avg'] * 1000:.0f} ms，"
+              f"p95 {stats['latency_p95'] * 1000:.0f} ms", flush=True)
+
+
+async def _serve(args):
+    server = MatchServer(args.jobs)
+    tasks = []
+    if args.report:
+        tasks.append(asyncio.create_task(_report(server, args.report)))
+    try:
+        if args.unix:
+            await server.serve_unix(args.unix)
+        else:
+            await server.serve_tcp(args.host, args.port)
+    finally:
+        for task in tasks:
+            task.cancel()
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='五子棋對局伺服器')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--unix', default=None, help='改用 Unix socket 的路徑')
+    parser.add_argument('--jobs', type=int, default=None, help='計算電腦落子的行程數（預設為 CPU 核心數）')
+    parser.add_argument('--report', type=float, default=10.0, help='每隔幾秒印出統計，0 為不印')
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+AI 評分的各種算法逐點比對：
+增量失效的評分快取（get_point_score）必須與每次重新計算（_get_point_score）的結果相同；
+查表評分（_get_point_score）必須等於原本逐格判斷的四個方向 _get_direction_score 之和；
+以 NumPy 一次算出整個棋盤的 evaluate_all（vectorized=True）必須與逐點評分的結果相同
+
+    python -m unittest test_ai        （在 Gomoku 目錄下）
+    python -m pytest Gomoku/test_ai.py
+"""
+
+import random
+import unittest
+import numpy as np
+from board import Point, BLACK_CHESSMAN, WHITE_CHESSMAN, BitBoard, offset
+from ai import AI
+
+LINE_POINTS = 15
+GAMES = 40
+MOVES = 80
+BOARDS = 200
+
+
+def _random_moves(rng, board, moves):
+    """
+    在 board 上隨機落子與悔棋，每一步之後 yield 一次；
+    約四分之一的步數是移除最後落下的子，快取要跟著失效回去
+    """
+    history = []
+    empty = [(x, y) for y in range(LINE_POINTS) for x in range(LINE_POINTS)]
+    for _ in range(moves):
+        if history and rng.random() < 0.25:
+            x, y = history.pop()
+            board.remove(x, y)
+            empty.append((x, y))
+        else:
+            x, y = empty.pop(rng.randrange(len(empty)))
+            board.place(x, y, rng.choice((1, 2)))
+            history.append((x, y))
+        yield
+
+
+def _random_board(rng):
+    """:return: 隨機密度的 BitBoard，密度高時棋子常貼著邊界、連成長串"""
+    board = BitBoard(LINE_POINTS)
+    density = rng.uniform(0.05, 0.7)
+    for y in range(LINE_POINTS):
+        for x in range(LINE_POINTS):
+            if rng.random() < density:
+                board.place(x, y, rng.choice((1, 2)))
+    return board
+
+
+class PatternTableTest(unittest.TestCase):
+    def test_table_matches_direction_scores(self):
+        """隨機棋盤上黑白雙方每個空點的查表分數，與四個方向 _get_direction_score 相加的結果相同"""
+        rng = random.Random(0)
+        for n in range(BOARDS):
+            board = _random_board(rng)
+            for chessman in (BLACK_CHESSMAN, WHITE_CHESSMAN):
+                ai = AI(LINE_POINTS, chessman, board)
+                for y in range(LINE_POINTS):
+                    for x in range(LINE_POINTS):
+                        if board.get(x, y) == 0:
+                            point = Point(x, y)
+                            expected = sum(ai._get_direction_score(point, x_offset, y_offset)
+                                           for x_offset, y_offset in offset)
+                            self.assertEqual(ai._get_point_score(point), expected, (n, chessman.Value, x, y))
+
+
+class ScoreCacheTest(unittest.TestCase):
+    def test_cached_scores_match_fresh_scores(self):
+        """多局隨機落子、悔棋，每一步之後比對黑白雙方所有空點的快取分數與重新計算的分數"""
+        hits = 0
+        for game in range(GAMES):
+            rng = random.Random(game)
+            board = BitBoard(LINE_POINTS)
+            ais = [AI(LINE_POINTS, BLACK_CHESSMAN, board), AI(LINE_POINTS, WHITE_CHESSMAN, board)]
+            for _ in _random_moves(rng, board, MOVES):
+                for ai in ais:
+                    for y in range(LINE_POINTS):
+                        for x in range(LINE_POINTS):
+                            if board.get(x, y) == 0:
+                                self.assertEqual(ai.get_point_score(x, y), ai._get_point_score(Point(x, y)),
+                                                 (game, board.count, x, y))
+            hits += sum(ai.cache_hits for ai in ais)
+        self.assertGreater(hits, 0)  # 確實比對到了快取命中的分數
+
+
+class VectorizedTest(unittest.TestCase):
+    def test_evaluate_all_matches_point_scores(self):
+        """
+        多局隨機落子、悔棋，每一步之後比對 vectorized 與逐點評分的 evaluate_all，
+        以及兩者的候選點排序
+        """
+        for game in range(GAMES):
+            rng = random.Random(game)
+            board = BitBoard(LINE_POINTS)
+            pairs = [(AI(LINE_POINTS, chessman, board), AI(LINE_POINTS, chessman, board, vectorized=True))
+                     for chessman in (BLACK_CHESSMAN, WHITE_CHESSMAN)]
+            for _ in _random_moves(rng, board, MOVES):
+                for ai, vectorized in pairs:
+                    np.testing.assert_array_equal(vectorized.evaluate_all(), ai.evaluate_all(),
+                                                  str((game, board.count)))
+                    self.assertEqual(vectorized.get_candidates(), ai.get_candidates(), (game, board.count))
+
+    def test_dense_boards(self):
+        """棋子貼著邊界、連成長串的隨機棋盤上，vectorized 的分數與逐點評分相同"""
+        rng = random.Random(1)
+        for n in range(BOARDS):
+            board = _random_board(rng)
+            for chessman in (BLACK_CHESSMAN, WHITE_CHESSMAN):
+                ai = AI(LINE_POINTS, chessman, board)
+                vectorized = AI(LINE_POINTS, chessman, board, vectorized=True)
+                np.testing.assert_array_equal(vectorized.evaluate_all(), ai.evaluate_all(), str((n, chessman.Value)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+以 NumPy 一次算出整個棋盤每個空點的棋型分數（熱度圖），結果與 AI.get_point_score 相同：
+沿四個方向把前後各 RADIUS 格以位移後的陣列疊成三進位編碼，再一次向量化查 patterns 的表
+"""
+
+from functools import lru_cache
+import numpy as np
+from board import Point, offset
+import patterns
+
+RADIUS = patterns.RADIUS
+_STEPS = [d for d in range(-RADIUS, RADIUS + 1) if d != 0]  # 第 j 格的權重為 3 ** j
+_CODES = 3 ** len(_STEPS)
+_dense_tables = {}
+
+
+def dense_table(table):
+    """
+    把 patterns 的 {key: 分數} 轉成以 (邊界 * 3 ** 10 + 三進位編碼) 為索引的陣列
+    """
+    dense = _dense_tables.get(id(table))
+    if dense is not None:
+        return dense
+    dense = np.zeros((RADIUS + 1) ** 2 * _CODES, dtype=np.float32)
+    bits = patterns.WINDOW_BITS
+    for key, score in table.items():
+        wall = key >> (2 * bits)
+        mine = (key >> bits) & patterns.WINDOW_MASK
+        theirs = key & patterns.WINDOW_MASK
+        code = 0
+        for j, d in enumerate(_STEPS):
+            pos = RADIUS + d
+            if mine >> pos & 1:
+                code += 3 ** j
+            elif theirs >> pos & 1:
+                code += 2 * 3 ** j
+        dense[wall * _CODES + code] = score
+    _dense_tables[id(table)] = dense
+    return dense
+
+
+@lru_cache(maxsize=None)
+def _walls(line_points):
+    """
+    每個方向上每個點的邊界索引（負方向格數 * (RADIUS + 1) + 正方向格數），已乘上 3 ** 10
+    :return: [方向] -> (n, n) 陣列，以 [y, x] 取值
+    """
+    n = line_points
+    ys, xs = np.mgrid[0:n, 0:n]
+    walls = []
+    for x_offset, y_offset in offset:
+        def steps(sign):
+            # 往 sign 方向還能走幾格仍在棋盤內
+            limit = np.full((n, n), RADIUS)
+            for dim, off in ((xs, x_offset), (ys, y_offset)):
+                if off * sign > 0:
+                    limit = np.minimum(limit, n - 1 - dim)
+                elif off * sign < 0:
+                    limit = np.minimum(limit, dim)
+            return limit
+        walls.append(((steps(-1) * (RADIUS + 1) + steps(1)) * _CODES).astype(np.int64))
+    return walls
+
+
+class ThreatMap:
+    """
+    訂閱 BitBoard 的變動，把棋盤同步成 NumPy 陣列；scores() 一次算出整個棋盤的分數
+    """
+
+    def __init__(self, board, table):
+        """
+        :param board: BitBoard
+        :param table: patterns 格式的查表（ai.PATTERN_TABLE）
+        """
+        n = board.line_points
+        self._line_points = n
+        self._board = board
+        self._dense = dense_table(table)
+        self._walls = _walls(n)
+        self._cells = np.array(board.cells, dtype=np.int8)
+        board.subscribe(self._sync)
+
+    @property
+    def cells(self):
+        """(n, n) 的 int8 陣列，以 [y, x] 取值"""
+        return self._cells
+
+    def _sync(self, x, y):
+        self._cells[y, x] = self._board.get(x, y)
+
+    def scores(self, value):
+        """
+        :return: (n, n) 陣列，空點為 value 一方的棋型分數，有子的點為 0
+        """
+        n = self._line_points
+        cells = self._cells
+        relative = np.where(cells == value, 1, np.where(cells != 0, 2, 0)).astype(np.int64)
+        padded = np.zeros((n + 2 * RADIUS, n + 2 * RADIUS), dtype=np.int64)
+        padded[RADIUS:RADIUS + n, RADIUS:RADIUS + n] = relative
+        total = np.zeros((n, n), dtype=np.float64)
+        for (x_offset, y_offset), walls in zip(offset, self._walls):
+            code = walls.copy()
+            for j, d in enumerate(_STEPS):
+                oy = RADIUS + d * y_offset
+                ox = RADIUS + d * x_offset
+                code += padded[oy:oy + n, ox:ox + n] * 3 ** j
+            total += self._dense[code]
+        total[cells != 0] = 0
+        return total
+
+    def ranked_moves(self, value, points=None):
+        """
+        :param points: 要排序的點，預設為棋盤的候選點
+        :return: [(分數, Point)]，依分數由高到低、同分依位置，與 AI.get_candidates 相同
+        """
+        if points is None:
+            points = self._board.candidates
+        points = list(points)
+        if not points:
+            return []
+        scores = self.scores(value)
+        xs = np.fromiter((point.X for point in points), dtype=np.int64, count=len(points))
+        ys = np.fromiter((point.Y for point in points), dtype=np.int64, count=len(points))
+        values = scores[ys, xs]
+        order = np.lexsort((xs, ys, -values))
+        return [(float(values[i]), Point(int(xs[i]), int(ys[i]))) for i in order]
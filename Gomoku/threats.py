@@ -0,0 +1,262 @@
+"""
+威脅空間搜尋：只考慮強制的著法，先找連續衝四取勝（VCF），再找衝四與活三交替取勝（VCT）。
+威脅直接從 BitBoard 的線遮罩以五格、六格視窗偵測：
+    成五點：五格視窗內有 4 子、1 空且無對方子，下在空點即連五
+    衝四點：五格視窗內有 3 子、2 空且無對方子，下在任一空點即成四
+    活三點：六格視窗兩端為空、中間四格有 2 子 2 空且無對方子，下在中間的空點即成活三
+"""
+
+from functools import lru_cache, partial
+from board import Point
+
+DEFAULT_NODES = 1000    # 每次 solve() 的節點預算，約 0.2 秒
+VCT_DEPTH = 4           # VCT 最多連續下幾手活三（中間可夾雜衝四）
+
+_POPCOUNT = [bin(i).count('1') for i in range(64)]
+
+
+class BudgetExceeded(Exception):
+    """節點預算用盡"""
+
+
+@lru_cache(maxsize=None)
+def _lines(line_points):
+    """
+    所有的線，方向順序與 board.offset 相同
+    :return: ((方向, 線索引, 最低位元, 最高位元, cells), ...)，cells[位元] 為該位元對應的 Point
+    """
+    n = line_points
+    lines = []
+    for i in range(n):
+        lines.append((0, i, 0, n - 1, tuple(Point(pos, i) for pos in range(n))))
+    for i in range(n):
+        lines.append((1, i, 0, n - 1, tuple(Point(i, pos) for pos in range(n))))
+    for k in (2, 3):
+        for i in range(2 * n - 1):
+            lo, hi = max(0, i - n + 1), min(n - 1, i)
+            if k == 2:
+                cells = tuple(Point(pos, pos - i + n - 1) if lo <= pos <= hi else None for pos in range(n))
+            else:
+                cells = tuple(Point(pos, i - pos) if lo <= pos <= hi else None for pos in range(n))
+            lines.append((k, i, lo, hi, cells))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def _point_lines(line_points):
+    """:return: point_lines[y][x] = 經過 (x, y) 的四條線（_lines 的元素）"""
+    n = line_points
+    index = {line[:2]: line for line in _lines(n)}
+    return tuple(tuple((index[0, y], index[1, x], index[2, x - y + n - 1], index[3, x + y])
+                       for x in range(n))
+                 for y in range(n))
+
+
+class Threats:
+    """一方在一組線上的威脅"""
+
+    __slots__ = ('fives', 'fours', 'threes', 'open_threes')
+
+    def __init__(self):
+        self.fives = set()      # 成五點
+        self.fours = set()      # 衝四點
+        self.threes = set()     # 活三點
+        self.open_threes = []   # 已有的活三：每個活三的防守點（兩端與中間的空點）
+
+
+def scan(board, value, lines=None, threes=True):
+    """
+    :param lines: 要掃描的線，預設為整個棋盤
+    :param threes: 是否偵測活三
+    :return: Threats
+    """
+    if lines is None:
+        lines = _lines(board.line_points)
+    mine_masks = board.masks(value)
+    their_masks = board.masks(3 - value)
+    result = Threats()
+    fewest = 2 if threes else 3     # 少於此子數的線不會有威脅
+    for k, i, lo, hi, cells in lines:
+        mine = mine_masks[k][i]
+        if not mine or bin(mine).count('1') < fewest:
+            continue
+        theirs = their_masks[k][i]
+        for shift in range(lo, hi - 3):
+            if (theirs >> shift) & 31:
+                continue
+            window = (mine >> shift) & 31
+            count = _POPCOUNT[window]
+            if count == 4:
+                result.fives.update(cells[shift + j] for j in range(5) if not window >> j & 1)
+            elif count == 3:
+                result.fours.update(cells[shift + j] for j in range(5) if not window >> j & 1)
+        if not threes:
+            continue
+        for shift in range(lo, hi - 4):
+            # 兩端為空、中間無對方子
+            if (theirs >> shift) & 63 or (mine >> shift) & 33:
+                continue
+            inner = (mine >> (shift + 1)) & 15
+            count = _POPCOUNT[inner]
+            if count == 3:
+                result.open_threes.append([cells[shift], cells[shift + 5]] +
+                                          [cells[shift + 1 + j] for j in range(4) if not inner >> j & 1])
+            elif count == 2:
+                result.threes.update(cells[shift + 1 + j] for j in range(4) if not inner >> j & 1)
+    return result
+
+
+class ThreatSolver:
+    """在 BitBoard 上暫放棋子搜尋，結束時還原"""
+
+    def __init__(self, board, max_nodes=DEFAULT_NODES, tick=None):
+        """
+        :param tick: 每個節點呼叫一次，可拋出例外中止搜尋，例如呼叫端自己的時間、節點預算與取消檢查；
+                     例外會原樣拋出 solve()，棋盤仍會還原
+        """
+        self._board = board
+        self._point_lines = _point_lines(board.line_points)
+        self.max_nodes = max_nodes
+        self._external_tick = tick
+        self.nodes = 0
+        self._vcf_failed = set()    # VCF 不成立的局面雜湊
+        self._vct_failed = {}       # 局面雜湊 -> 已證明不成立的最大深度
+
+    def solve(self, value, vct=True):
+        """
+        :param value: 進攻方
+        :return: 必勝的著法序列 [進攻, 防守, 進攻, ...]（防守方取其中一種應手），找不到或預算用盡時為 None
+        """
+        self.nodes = 0
+        try:
+            sequence = self._vcf(value)
+            if sequence is None and vct:
+                for depth in range(1, VCT_DEPTH + 1):
+                    sequence = self._vct(value, depth)
+                    if sequence is not None:
+                        break
+        except BudgetExceeded:
+            return None
+        return sequence
+
+    def _tick(self):
+        self.nodes += 1
+        if self._external_tick is not None:
+            self._external_tick()
+        if self.nodes > self.max_nodes:
+            raise BudgetExceeded()
+
+    def _vcf(self, value):
+        self._tick()
+        board = self._board
+        mine = scan(board, value, threes=False)
+        if mine.fives:
+            return [min(mine.fives, key=_order)]
+        key = board.hash
+        if key in self._vcf_failed:
+            return None
+        moves = mine.fours
+        their_fives = scan(board, 3 - value, threes=False).fives
+        if their_fives:
+            # 對方已成四：只能以擋住它的衝四繼續
+            moves = moves & their_fives if len(their_fives) == 1 else set()
+        for point in sorted(moves, key=_order):
+            sequence = self._try_four(value, point, self._vcf)
+            if sequence is not None:
+                return sequence
+        self._vcf_failed.add(key)
+        return None
+
+    def _try_four(self, value, point, then):
+        """
+        衝四後對方必須擋在成五點，再以 then(value) 繼續
+        :return: 成立時回傳從 point 開始的序列
+        """
+        board = self._board
+        board.place(point.X, point.Y, value)
+        try:
+            fives = scan(board, value, self._point_lines[point.Y][point.X], threes=False).fives
+            if len(fives) >= 2:
+                return [point]      # 活四或雙四，對方擋不完
+            if not fives:
+                return None
+            block = fives.pop()
+            board.place(block.X, block.Y, 3 - value)
+            try:
+                if board.is_five(block.X, block.Y):
+                    return None
+                sequence = then(value)
+            finally:
+                board.remove(block.X, block.Y)
+            return [point, block] + sequence if sequence is not None else None
+        finally:
+            board.remove(point.X, point.Y)
+
+    def _vct(self, value, depth):
+        sequence = self._vcf(value)
+        if sequence is not None or depth == 0:
+            return sequence
+        board = self._board
+        key = board.hash
+        if self._vct_failed.get(key, -1) >= depth:
+            return None
+        theirs = scan(board, 3 - value)
+        mine = scan(board, value)
+        # 先衝四（不計入深度）再接 VCT，例如衝四佔位後再下活三
+        fours = mine.fours
+        if theirs.fives:
+            fours = fours & theirs.fives if len(theirs.fives) == 1 else set()
+        for point in sorted(fours, key=_order):
+            sequence = self._try_four(value, point, partial(self._vct, depth=depth))
+            if sequence is not None:
+                return sequence
+        # 對方已成四或有活三時，下活三太慢
+        if not theirs.fives and not theirs.open_threes:
+            for point in sorted(mine.threes - mine.fours, key=_order):
+                sequence = self._try_three(value, point, depth, theirs.fours)
+                if sequence is not None:
+                    return sequence
+        self._vct_failed[key] = depth
+        return None
+
+    def _try_three(self, value, point, depth, their_fours):
+        """下活三後，對方的每種防守（擋活三或反衝四）都仍能取勝才成立"""
+        board = self._board
+        board.place(point.X, point.Y, value)
+        try:
+            threats = scan(board, value, self._point_lines[point.Y][point.X]).open_threes
+            if not threats:
+                return None
+            replies = {cell for cells in threats for cell in cells} | their_fours
+            principal = None
+            for reply in sorted(replies, key=_order):
+                if board.get(reply.X, reply.Y):
+                    continue
+                self._tick()
+                board.place(reply.X, reply.Y, 3 - value)
+                try:
+                    if board.is_five(reply.X, reply.Y):
+                        return None
+                    sequence = self._vct(value, depth - 1)
+                finally:
+                    board.remove(reply.X, reply.Y)
+                if sequence is None:
+                    return None
+                if principal is None:
+                    principal = [reply] + sequence
+            return [point] + principal if principal is not None else None
+        finally:
+            board.remove(point.X, point.Y)
+
+
+def _order(point):
+    return point.Y, point.X
+
+
+def solve(board, value, max_nodes=DEFAULT_NODES, vct=True):
+    """
+    :param board: BitBoard，或 Checkerboard（取其 board）
+    :return: value 一方必勝的著法序列，或 None
+    """
+    board = getattr(board, 'board', board)
+    return ThreatSolver(board, max_nodes).solve(value, vct)
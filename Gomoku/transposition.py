@@ -0,0 +1,68 @@
+"""置換表：以 Zobrist 雜湊記錄搜尋過的局面，避免不同落子順序重複搜尋"""
+
+from collections import namedtuple
+
+# 分數性質
+EXACT = 0   # 精確值
+LOWER = 1   # 下界（發生 beta 剪枝）
+UPPER = 2   # 上界（所有著法都沒超過 alpha）
+
+Entry = namedtuple('Entry', 'key depth flag score move generation')
+
+
+class TranspositionTable:
+    """
+    固定大小的雜湊表，槽位數為 2 的冪次，以雜湊低位元定位。
+    槽位衝突時保留較深的結果，但舊回合留下的項目一律可被覆蓋，使記憶體固定不變
+    """
+
+    def __init__(self, size_bits=16):
+        self._mask = (1 << size_bits) - 1
+        self._slots = [None] * (1 << size_bits)
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def new_search(self):
+        """每次搜尋開始時呼叫，前一回合的項目變為可替換"""
+        self._generation += 1
+
+    def clear(self):
+        self._slots = [None] * len(self._slots)
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def probe(self, key):
+        """
+        :return: 命中時回傳 Entry，否則 None
+        """
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        index = key & self._mask
+        old = self._slots[index]
+        if old is not None:
+            if old.key != key and old.generation == self._generation and old.depth > depth:
+                return
+            if old.key != key:
+                self.overwrites += 1
+        self._slots[index] = Entry(key, depth, flag, score, move, self._generation)
+        self.stores += 1
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'tt_hits': self.hits, 'tt_misses': self.misses, 'tt_hit_rate': self.hit_rate,
+                'tt_stores': self.stores, 'tt_overwrites': self.overwrites}
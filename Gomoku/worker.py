@@ -0,0 +1,93 @@
+"""在背景執行緒替 AI 思考，讓 pygame 主迴圈在電腦思考時仍能重繪與處理事件"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+
+class AIWorker:
+    """
+    一次只處理一步：request() 交出對方的落子，主迴圈每幀以 poll() 取回電腦的落子。
+    engine 需提供 get_opponent_drop / AI_drop，並應自行維護棋盤（不與介面共用），
+    否則搜尋時暫放的棋子會被畫出來。
+    輪到玩家時可用 ponder() 讓支援預想的 engine 在背景先行思考，
+    下一次 request() 會先中止預想
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gomoku-ai')
+        self._future = None
+        self._engine = None
+        self._ponder_future = None
+        self._ponder_engine = None
+        self.started = None     # 本次思考開始的時間
+
+    @property
+    def thinking(self):
+        return self._future is not None
+
+    @property
+    def pondering(self):
+        return self._ponder_future is not None and not self._ponder_future.done()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started if self.thinking else 0.0
+
+    def request(self, engine, opponent_point):
+        """在背景依序呼叫 engine.get_opponent_drop(opponent_point) 與 engine.AI_drop()"""
+        self.cancel()
+        self.stop_pondering()
+        self._engine = engine
+        self.started = time.perf_counter()
+        self._future = self._executor.submit(self._think, engine, opponent_point)
+
+    @staticmethod
+    def _think(engine, opponent_point):
+        engine.get_opponent_drop(opponent_point)
+        return engine.AI_drop()
+
+    def ponder(self, engine):
+        """engine 支援 ponder() 時，在背景預想對方的應手"""
+        ponder = getattr(engine, 'ponder', None)
+        if ponder is None:
+            return
+        self.stop_pondering()
+        self._ponder_engine = engine
+        self._ponder_future = self._executor.submit(ponder)
+
+    def stop_pondering(self):
+        if self._ponder_future is None:
+            return
+        # 尚未開始的直接取消，進行中的請 engine 盡快結束；已得到的結果仍保留在 engine 內
+        if not self._ponder_future.cancel():
+            self._ponder_engine.cancel()
+        self._ponder_future = None
+        self._ponder_engine = None
+
+    def poll(self):
+        """
+        :return: 思考完成時回傳電腦的落子位置，尚未完成或沒有工作時回傳 None
+        """
+        if self._future is None or not self._future.done():
+            return None
+        future, self._future = self._future, None
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+
+    def cancel(self):
+        """放棄進行中的思考；搜尋引擎若支援 cancel() 會盡快停止"""
+        if self._future is None:
+            return
+        self._future.cancel()
+        cancel = getattr(self._engine, 'cancel', None)
+        if cancel is not None:
+            cancel()
+        self._future = None
+        self._engine = None
+
+    def shutdown(self):
+        self.cancel()
+        self.stop_pondering()
+        self._executor.shutdown(wait=False)
@@ -1,6 +1,8 @@
 import sys
 import time
 import os
+from enum import Enum
+import numpy as np
 import pygame
 from pygame.locals import *
 from mineblock import *
@@ -129,6 +131,10 @@ def main():
     start_time = None
     elapsed_time = 0
     game_screen = None
+    # 盤面只重畫狀態有變的格子，畫面也只更新這些格子與上方的資訊列
+    full_redraw = True      # 下一幀是否整個重畫（開新局時）
+    drawn_over = False      # 盤面上是否已畫出所有地雷
+    dirty = None            # 這一幀要更新的範圍，None 為整個畫面
     x = 0
     y = 0
     b1 = False
@@ -201,13 +207,15 @@ def main():
                         
                         game_state = GameState.GAME
                         block = MineBlock(board_size, difficulty)
+                        full_redraw = True
                         game_status = GameStatus.READY
                         start_time = None
                         elapsed_time = 0
         
         else:  # GameState.GAME
             # Fill background
-            game_screen.fill((225, 225, 225))
+            header = pygame.Rect(0, 0, block.width * SIZE, SIZE * 2)
+            game_screen.fill((225, 225, 225), header)
             
             # Get current mouse button states
             b1, b2, b3 = pygame.mouse.get_pressed()
@@ -237,71 +245,76 @@ def main():
                         elapsed_time = 0
                     
                     if game_status == GameStatus.STARTED:
-                        mine = block.getmine(x, y)
-                        if mine:
+                        index = block.getmine(x, y)
+                        if index is not None:
+                            status = block.status.flat[index]
                             if event.button == 1 and not b3:  # 左键
-                                if mine.status == BlockStatus.normal:
-                                    if not block.open_mine(x, y):
-                                        game_status = GameStatus.OVER
+                                if status == BlockStatus.normal:
+                                    block.open_mine(x, y)
                             elif event.button == 3 and not b1:  # 右键
-                                if mine.status == BlockStatus.normal:
-                                    mine.status = BlockStatus.flag
-                                elif mine.status == BlockStatus.flag:
-                                    mine.status = BlockStatus.ask
-                                elif mine.status == BlockStatus.ask:
-                                    mine.status = BlockStatus.normal
+                                block.mark(x, y)
                             elif event.button == 1 and b3 or event.button == 3 and b1:  # 左右键同时按下
-                                if mine.status == BlockStatus.opened:
-                                    if not block.double_mouse_button_down(x, y):
-                                        game_status = GameStatus.OVER
+                                if status == BlockStatus.opened:
+                                    block.double_mouse_button_down(x, y)
 
                 elif event.type == MOUSEBUTTONUP:
                     if game_status == GameStatus.STARTED:
-                        mine = block.getmine(x, y)
-                        if mine and mine.status == BlockStatus.double:
+                        index = block.getmine(x, y)
+                        if index is not None and block.status.flat[index] == BlockStatus.double:
                             block.double_mouse_button_up(x, y)
+
+            # Check win condition
+            if game_status == GameStatus.STARTED:
+                if block.lost:
+                    game_status = GameStatus.OVER
+                elif block.won:
+                    game_status = GameStatus.WON
             
-            # Draw game board
-            flag_count = 0
-            opened_count = 0
-            
-            for row in block.block:
-                for mine in row:
-                    pos = (mine.x * SIZE, (mine.y + 2) * SIZE)
-                    if mine.status == BlockStatus.opened:
-                        game_screen.blit(img_dict[mine.around_mine_count], pos)
-                        opened_count += 1
-                    elif mine.status == BlockStatus.double:
-                        game_screen.blit(img_dict[mine.around_mine_count], pos)
-                    elif mine.status == BlockStatus.bomb:
-                        game_screen.blit(img_blood, pos)
-                    elif mine.status == BlockStatus.flag:
-                        game_screen.blit(img_flag, pos)
-                        flag_count += 1
-                    elif mine.status == BlockStatus.ask:
-                        game_screen.blit(img_ask, pos)
-                    elif mine.status == BlockStatus.hint:
-                        game_screen.blit(img_dict[0], pos)
-                    elif game_status == GameStatus.OVER and mine.value:
-                        game_screen.blit(img_mine, pos)
-                    elif mine.value == 0 and mine.status == BlockStatus.flag:
-                        game_screen.blit(img_error, pos)
-                    elif mine.status == BlockStatus.normal:
-                        game_screen.blit(img_blank, pos)
+            # Draw game board: only the cells MineBlock reports as changed since the last frame,
+            # or everything on a new board and when the mines are revealed
+            over = game_status == GameStatus.OVER
+            changed = block.take_changed()
+            if full_redraw or over != drawn_over:
+                changed = np.arange(block.width * block.height)
+                full_redraw = False
+                drawn_over = over
+                dirty = None
+            else:
+                dirty = [header]
+            cells = zip(changed.tolist(), block.status.flat[changed].tolist(),
+                        block.counts.flat[changed].tolist(), block.mines.flat[changed].tolist())
+            for index, status, count, mine in cells:
+                pos = (index % block.width * SIZE, (index // block.width + 2) * SIZE)
+                if dirty is not None:
+                    dirty.append((pos[0], pos[1], SIZE, SIZE))
+                if status == BlockStatus.opened:
+                    game_screen.blit(img_dict[count], pos)
+                elif status == BlockStatus.double:
+                    game_screen.blit(img_dict[count], pos)
+                elif status == BlockStatus.bomb:
+                    game_screen.blit(img_blood, pos)
+                elif status == BlockStatus.flag:
+                    game_screen.blit(img_flag, pos)
+                elif status == BlockStatus.ask:
+                    game_screen.blit(img_ask, pos)
+                elif status == BlockStatus.hint:
+                    game_screen.blit(img_dict[0], pos)
+                elif over and mine:
+                    game_screen.blit(img_mine, pos)
+                elif not mine and status == BlockStatus.flag:
+                    game_screen.blit(img_error, pos)
+                elif status == BlockStatus.normal:
+                    game_screen.blit(img_blank, pos)
             
             # Draw mine count and timer
             print_text(game_screen, font1, 30, (SIZE * 2 - font1.get_height()) // 2 - 2, 
-                      '%02d' % (block.mine_count - flag_count), RED)
+                      '%02d' % (block.mine_count - block.flag_count), RED)
             
             if game_status == GameStatus.STARTED:
                 elapsed_time = int(time.time() - start_time)
             print_text(game_screen, font1, game_screen.get_width() - 100, (SIZE * 2 - font1.get_height()) // 2 - 2, 
                       '%03d' % elapsed_time, RED)
             
-            # Check win condition
-            if flag_count + opened_count == block.width * block.height:
-                game_status = GameStatus.WON
-            
             # Draw face
             face_pos_x = (block.width * SIZE - int(SIZE * 1.25)) // 2
             face_pos_y = (SIZE * 2 - int(SIZE * 1.25)) // 2
@@ -313,7 +326,10 @@ def main():
             else:
                 game_screen.blit(img_face_normal, (face_pos_x, face_pos_y))
         
-        pygame.display.update()
+        if game_state == GameState.GAME and dirty is not None:
+            pygame.display.update(dirty)
+        else:
+            pygame.display.update()
 
 if __name__ == '__main__':
     main()
@@ -1,5 +1,6 @@
 import random
-from enum import Enum
+from enum import IntEnum
+import numpy as np
 from config import BoardSize, Difficulty, BOARD_SIZES, DIFFICULTY_MINE_PERCENT, SIZE
 
 BLOCK_WIDTH = 30
@@ -7,7 +8,32 @@ BLOCK_HEIGHT = 16
 SIZE = 20           # 块大小
 MINE_COUNT = 99     # 地雷数
 
-class BlockStatus(Enum):
+
+def _count_around(mines):
+    """
+    以 3x3 卷積算出每格周圍的雷數：周圍補一圈 0 後把九個位移相加，再扣掉自己
+    :param mines: (高, 寬) bool 的地雷分布
+    :return: (高, 寬) uint8
+    """
+    height, width = mines.shape
+    padded = np.pad(mines, 1).view(np.uint8)
+    counts = np.zeros((height, width), np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            counts += padded[dy:dy + height, dx:dx + width]
+    return counts - mines
+
+
+def _grow(mask, height, width):
+    """:return: mask 每格的九宮格聯集，mask 比結果上下左右各多一格"""
+    grown = np.zeros((height, width), bool)
+    for dy in range(3):
+        for dx in range(3):
+            grown |= mask[dy:dy + height, dx:dx + width]
+    return grown
+
+
+class BlockStatus(IntEnum):
     normal = 1  # 未点击
     opened = 2  # 已点击
     mine = 3    # 地雷
@@ -17,62 +43,6 @@ class BlockStatus(Enum):
     hint = 7    # 被双击的周围
     double = 8  # 正被鼠标左右键双击
 
-class Mine:
-    def __init__(self, x, y, value=0):
-        self._x = x
-        self._y = y
-        self._value = 0
-        self._around_mine_count = -1
-        self._status = BlockStatus.normal
-        self.set_value(value)
-
-    def __repr__(self):
-        return str(self._value)
-        # return f'({self._x},{self._y})={self._value}, status={self.status}'
-
-    def get_x(self):
-        return self._x
-
-    def set_x(self, x):
-        self._x = x
-
-    x = property(fget=get_x, fset=set_x)
-
-    def get_y(self):
-        return self._y
-
-    def set_y(self, y):
-        self._y = y
-
-    y = property(fget=get_y, fset=set_y)
-
-    def get_value(self):
-        return self._value
-
-    def set_value(self, value):
-        if value:
-            self._value = 1
-        else:
-            self._value = 0
-
-    value = property(fget=get_value, fset=set_value, doc='0:非地雷 1:雷')
-
-    def get_around_mine_count(self):
-        return self._around_mine_count
-
-    def set_around_mine_count(self, around_mine_count):
-        self._around_mine_count = around_mine_count
-
-    around_mine_count = property(fget=get_around_mine_count, fset=set_around_mine_count, doc='四周地雷数量')
-
-    def get_status(self):
-        return self._status
-
-    def set_status(self, value):
-        self._status = value
-
-    status = property(fget=get_status, fset=set_status, doc='BlockStatus')
-
 
 class MineBlock:
     def __init__(self, board_size=BoardSize.MEDIUM, difficulty=Difficulty.MEDIUM):
@@ -80,81 +50,149 @@ class MineBlock:
         self.width = self.board_size["width"]
         self.height = self.board_size["height"]
         self.mine_count = int(self.width * self.height * DIFFICULTY_MINE_PERCENT[difficulty])
-        
-        self._block = [[Mine(i, j) for i in range(self.width)] for j in range(self.height)]
-        
+
+        # 盤面以 (高, 寬) 的陣列記錄，[y, x] 為 (x, y) 這格
+        self.mines = np.zeros((self.height, self.width), bool)                  # 是否為雷
         # 埋雷
-        for i in random.sample(range(self.width * self.height), self.mine_count):
-            self._block[i // self.width][i % self.width].value = 1
+        self.mines.flat[random.sample(range(self.width * self.height), self.mine_count)] = True
+        self.counts = _count_around(self.mines)                                 # 周圍的雷數
+        self.status = np.full((self.height, self.width), BlockStatus.normal, np.uint8)  # BlockStatus
+        self._opened = np.zeros((self.height, self.width), bool)                # 已打開（含正被雙擊的）
+        # 隨狀態改變更新的計數，勝負判定不必掃描整個盤面
+        self.opened_count = 0   # 已打開的格子數
+        self.flag_count = 0     # 標記為地雷的格子數
+        self.lost = False       # 是否踩到雷
+        self._changed = []      # 狀態有變的格子索引（陣列），由 take_changed() 取出
+
+        # 展開用：周圍沒有雷的空白格，外圍補一圈 False 後攤平，鄰格索引不必檢查邊界
+        self._zero = np.pad((self.counts == 0) & ~self.mines, 1).ravel()
+        row = self.width + 2
+        self._offsets = np.array([dy * row + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx])
 
     @property
-    def block(self):
-        return self._block
+    def won(self):
+        """所有格子都已打開或標記為地雷"""
+        return self.opened_count + self.flag_count == self.width * self.height
+
+    def take_changed(self):
+        """:return: 上次呼叫以來狀態有變的格子索引 y * width + x（不重複），畫面只需重畫這些格子"""
+        if not self._changed:
+            return np.empty(0, np.intp)
+        changed = np.unique(np.concatenate(self._changed))
+        self._changed.clear()
+        return changed
+
+    def _set_status(self, x, y, status):
+        self.status[y, x] = status
+        self._changed.append(np.array([y * self.width + x]))
+
+    def _set_around(self, rows, cols, before, after):
+        """把九宮格 (rows, cols) 中狀態為 before 的格子改成 after"""
+        around = self.status[rows, cols]
+        j, i = (around == before).nonzero()
+        around[j, i] = after
+        self._changed.append((j + rows.start) * self.width + i + cols.start)
 
     def getmine(self, x, y):
+        """:return: (x, y) 在攤平的陣列中的索引 y * width + x，不在盤面上時為 None"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self._block[y][x]
+            return y * self.width + x
         return None
 
     def _get_around(self, x, y):
-        """返回(x, y)周围的点的坐标"""
-        return [(i, j) for i in range(max(0, x - 1), min(self.width, x + 2))
-                for j in range(max(0, y - 1), min(self.height, y + 2))
-                if i != x or j != y]
+        """:return: (x, y) 九宮格的 (列的 slice, 欄的 slice)"""
+        return slice(max(0, y - 1), y + 2), slice(max(0, x - 1), x + 2)
 
     def open_mine(self, x, y):
+        """
+        打開 (x, y)；周圍沒有雷時連同相連的空白區與其外圍一起打開
+        :return: 這次打開的格子索引 y * width + x 的陣列，踩到雷時為 None
+        """
         # 踩到雷了
-        if self._block[y][x].value:
-            self._block[y][x].status = BlockStatus.bomb
-            return False
+        if self.mines[y, x]:
+            self._set_status(x, y, BlockStatus.bomb)
+            self.lost = True
+            return None
+        if self._opened[y, x]:
+            return np.empty(0, np.intp)
+
+        width, height = self.width, self.height
+        zero, row = self._zero, width + 2
+        start = (y + 1) * row + x + 1
+        if not zero[start]:
+            if self.status[y, x] == BlockStatus.flag:
+                self.flag_count -= 1
+            self._opened[y, x] = True
+            self._set_status(x, y, BlockStatus.opened)
+            self.opened_count += 1
+            return np.array([y * width + x])
+
+        # 逐層展開相連的空白格：每次取出上一層所有空白格的八個鄰格，留下還沒走過的空白格
+        seen = np.zeros(zero.size, bool)
+        seen[start] = True
+        last = np.empty(zero.size, np.int32)
+        frontier = np.array([start])
+        reached = [frontier]
+        while frontier.size:
+            around = (frontier[:, None] + self._offsets).ravel()
+            around = around[zero[around] & ~seen[around]]
+            # 同一格可能是好幾格的鄰格：各自寫入自己的序號，只留下序號寫入成功的那一個
+            order = np.arange(around.size, dtype=np.int32)
+            last[around] = order
+            around = around[last[around] == order]
+            seen[around] = True
+            reached.append(around)
+            frontier = around
+
+        # 打開空白區與其外圍：只處理空白區外框（多一格）的範圍
+        reached = np.concatenate(reached)
+        rows, cols = reached // row - 1, reached % row - 1
+        top, bottom = max(rows.min() - 1, 0), min(rows.max() + 2, height)
+        left, right = max(cols.min() - 1, 0), min(cols.max() + 2, width)
+        region = seen.reshape(height + 2, width + 2)[top:bottom + 2, left:right + 2]
+        opened = self._opened[top:bottom, left:right]
+        new = _grow(region, bottom - top, right - left) & ~opened
+        opened |= new
+        status = self.status[top:bottom, left:right]
+        self.flag_count -= int(np.count_nonzero(status[new] == BlockStatus.flag))  # 被展開到的旗子
+        status[new] = BlockStatus.opened
+        new_rows, new_cols = new.nonzero()
+        self.opened_count += len(new_rows)
+        indices = (new_rows + top) * width + new_cols + left
+        self._changed.append(indices)
+        return indices
+
+    def mark(self, x, y):
+        """右鍵：未打開的格子依序切換 未点击 -> 标记为地雷 -> 标记为问号 -> 未点击"""
+        status = self.status[y, x]
+        if status == BlockStatus.normal:
+            self._set_status(x, y, BlockStatus.flag)
+            self.flag_count += 1
+        elif status == BlockStatus.flag:
+            self._set_status(x, y, BlockStatus.ask)
+            self.flag_count -= 1
+        elif status == BlockStatus.ask:
+            self._set_status(x, y, BlockStatus.normal)
 
-        # 先把状态改为 opened
-        self._block[y][x].status = BlockStatus.opened
-
-        around = self._get_around(x, y)
+    def double_mouse_button_down(self, x, y):
+        if self.counts[y, x] == 0:
+            return True
 
-        _sum = 0
-        for i, j in around:
-            if self._block[j][i].value:
-                _sum += 1
-        self._block[y][x].around_mine_count = _sum
+        self._set_status(x, y, BlockStatus.double)
 
-        # 如果周围没有雷，那么将周围8个未中未点开的递归算一遍
-        # 这就能实现一点出现一大片打开的效果了
-        if _sum == 0:
-            for i, j in around:
-                if self._block[j][i].around_mine_count == -1:
-                    self.open_mine(i, j)
+        rows, cols = self._get_around(x, y)
+        around = self.status[rows, cols]
 
+        # 周边的雷已经全部被标记（中間這格是 double，不會算進去）
+        if np.count_nonzero(around == BlockStatus.flag) == self.counts[y, x]:
+            result = True
+            for j, i in np.argwhere(around == BlockStatus.normal):
+                if self.open_mine(cols.start + i, rows.start + j) is None:
+                    result = False
+            return result
+        self._set_around(rows, cols, BlockStatus.normal, BlockStatus.hint)
         return True
 
-    def double_mouse_button_down(self, x, y):
-        if self._block[y][x].around_mine_count == 0:
-            return True
-
-        self._block[y][x].status = BlockStatus.double
-
-        around = self._get_around(x, y)
-
-        sumflag = 0     # 周围被标记的雷数量
-        for i, j in self._get_around(x, y):
-            if self._block[j][i].status == BlockStatus.flag:
-                sumflag += 1
-        # 周边的雷已经全部被标记
-        result = True
-        if sumflag == self._block[y][x].around_mine_count:
-            for i, j in around:
-                if self._block[j][i].status == BlockStatus.normal:
-                    if not self.open_mine(i, j):
-                        result = False
-        else:
-            for i, j in around:
-                if self._block[j][i].status == BlockStatus.normal:
-                    self._block[j][i].status = BlockStatus.hint
-        return result
-
     def double_mouse_button_up(self, x, y):
-        self._block[y][x].status = BlockStatus.opened
-        for i, j in self._get_around(x, y):
-            if self._block[j][i].status == BlockStatus.hint:
-                self._block[j][i].status = BlockStatus.normal
+        self._set_status(x, y, BlockStatus.opened)
+        self._set_around(*self._get_around(x, y), BlockStatus.hint, BlockStatus.normal)
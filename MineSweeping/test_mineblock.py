@@ -0,0 +1,243 @@
+"""
+MineBlock 與原本以遞迴展開、每格一個 Mine 物件的版本逐步比對：
+同樣的種子埋同樣的雷，隨機打開、標記、雙擊之後每一格的狀態與周圍雷數必須相同；
+隨狀態更新的計數、勝負與 take_changed() 必須與掃描整個盤面的結果一致
+
+    python -m unittest test_mineblock        （在 MineSweeping 目錄下）
+    python -m pytest MineSweeping/test_mineblock.py
+"""
+
+import random
+import unittest
+from unittest import mock
+import numpy as np
+from config import BoardSize, Difficulty, BOARD_SIZES, DIFFICULTY_MINE_PERCENT
+from mineblock import MineBlock, BlockStatus
+
+GAMES = 300
+ACTIONS = 60
+MAX_SIDE = 30   # 原本的版本以遞迴展開，盤面太大會超過遞迴深度上限
+
+
+class Mine:
+    """原本的格子：是否為雷、周圍雷數（未打開時為 -1）與 BlockStatus"""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.value = 0
+        self.around_mine_count = -1
+        self.status = BlockStatus.normal
+
+
+class RecursiveMineBlock:
+    """原本的 MineBlock：每格一個 Mine 物件，周圍沒有雷時遞迴打開八個鄰格"""
+
+    def __init__(self, board_size, difficulty):
+        board_size = BOARD_SIZES[board_size]
+        self.width = board_size["width"]
+        self.height = board_size["height"]
+        self.mine_count = int(self.width * self.height * DIFFICULTY_MINE_PERCENT[difficulty])
+        self.block = [[Mine(i, j) for i in range(self.width)] for j in range(self.height)]
+        for i in random.sample(range(self.width * self.height), self.mine_count):
+            self.block[i // self.width][i % self.width].value = 1
+
+    def getmine(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.block[y][x]
+        return None
+
+    def _get_around(self, x, y):
+        return [(i, j) for i in range(max(0, x - 1), min(self.width, x + 2))
+                for j in range(max(0, y - 1), min(self.height, y + 2))
+                if i != x or j != y]
+
+    def open_mine(self, x, y):
+        if self.block[y][x].value:
+            self.block[y][x].status = BlockStatus.bomb
+            return False
+        self.block[y][x].status = BlockStatus.opened
+        around = self._get_around(x, y)
+        _sum = sum(self.block[j][i].value for i, j in around)
+        self.block[y][x].around_mine_count = _sum
+        if _sum == 0:
+            for i, j in around:
+                if self.block[j][i].around_mine_count == -1:
+                    self.open_mine(i, j)
+        return True
+
+    def mark(self, x, y):
+        """原本寫在 main.py 的右鍵處理"""
+        mine = self.block[y][x]
+        if mine.status == BlockStatus.normal:
+            mine.status = BlockStatus.flag
+        elif mine.status == BlockStatus.flag:
+            mine.status = BlockStatus.ask
+        elif mine.status == BlockStatus.ask:
+            mine.status = BlockStatus.normal
+
+    def double_mouse_button_down(self, x, y):
+        if self.block[y][x].around_mine_count == 0:
+            return True
+        self.block[y][x].status = BlockStatus.double
+        around = self._get_around(x, y)
+        sumflag = sum(self.block[j][i].status == BlockStatus.flag for i, j in around)
+        result = True
+        if sumflag == self.block[y][x].around_mine_count:
+            for i, j in around:
+                if self.block[j][i].status == BlockStatus.normal:
+                    if not self.open_mine(i, j):
+                        result = False
+        else:
+            for i, j in around:
+                if self.block[j][i].status == BlockStatus.normal:
+                    self.block[j][i].status = BlockStatus.hint
+        return result
+
+    def double_mouse_button_up(self, x, y):
+        self.block[y][x].status = BlockStatus.opened
+        for i, j in self._get_around(x, y):
+            if self.block[j][i].status == BlockStatus.hint:
+                self.block[j][i].status = BlockStatus.normal
+
+    def scan(self):
+        """原本 main.py 每一幀掃描整個盤面算出的 (已打開的格子數, 標記為地雷的格子數)"""
+        statuses = [mine.status for row in self.block for mine in row]
+        return statuses.count(BlockStatus.opened), statuses.count(BlockStatus.flag)
+
+    def state(self):
+        """:return: [y][x] = (狀態, 周圍雷數)，周圍雷數只有畫面會顯示的已打開格子才計入"""
+        return [[(int(mine.status), mine.around_mine_count
+                  if mine.status in (BlockStatus.opened, BlockStatus.double) else -1)
+                 for mine in row] for row in self.block]
+
+
+def _state(block):
+    """:return: 與 RecursiveMineBlock.state() 相同格式的 MineBlock 盤面"""
+    shown = (block.status == BlockStatus.opened) | (block.status == BlockStatus.double)
+    counts = np.where(shown, block.counts.astype(int), -1)
+    return [list(zip(status, count)) for status, count in zip(block.status.tolist(), counts.tolist())]
+
+
+def _pair(seed, width, height, difficulty):
+    """:return: 以同一個種子埋雷的 (MineBlock, RecursiveMineBlock)"""
+    with mock.patch.dict(BOARD_SIZES, {BoardSize.SMALL: {"width": width, "height": height}}):
+        random.seed(seed)
+        block = MineBlock(BoardSize.SMALL, difficulty)
+        random.seed(seed)
+        reference = RecursiveMineBlock(BoardSize.SMALL, difficulty)
+    return block, reference
+
+
+class MineBlockTest(unittest.TestCase):
+    def test_random_actions_match_recursive_block(self):
+        """
+        多局隨機打開、標記、雙擊（按下後放開），每一步之後比對整個盤面；
+        打開時的回傳值要對得上，回傳的索引正好是這次新打開的格子
+        """
+        opened = 0
+        for game in range(GAMES):
+            rng = random.Random(game)
+            width, height = rng.randint(1, MAX_SIDE), rng.randint(1, MAX_SIDE)
+            block, reference = _pair(game, width, height, rng.choice(list(Difficulty)))
+            self.assertEqual(block.mines.astype(int).tolist(), [[mine.value for mine in row] for row in reference.block])
+            for step in range(ACTIONS):
+                x, y = rng.randrange(width), rng.randrange(height)
+                status = reference.getmine(x, y).status
+                self.assertEqual(block.getmine(x, y), y * width + x)
+                action = rng.random()
+                if action < 0.5:
+                    if status == BlockStatus.normal:
+                        before = block.status == BlockStatus.opened
+                        indices = block.open_mine(x, y)
+                        self.assertEqual(indices is not None, reference.open_mine(x, y), (game, step))
+                        if indices is not None:
+                            new = np.flatnonzero((block.status == BlockStatus.opened) & ~before)
+                            self.assertEqual(sorted(indices.tolist()), new.tolist(), (game, step))
+                            opened += len(indices)
+                elif action < 0.8:
+                    block.mark(x, y)
+                    reference.mark(x, y)
+                elif status == BlockStatus.opened:
+                    self.assertEqual(block.double_mouse_button_down(x, y),
+                                     reference.double_mouse_button_down(x, y), (game, step))
+                    self.assertEqual(_state(block), reference.state(), (game, step))
+                    if reference.getmine(x, y).status == BlockStatus.double:
+                        block.double_mouse_button_up(x, y)
+                        reference.double_mouse_button_up(x, y)
+                self.assertEqual(_state(block), reference.state(), (game, step))
+        self.assertGreater(opened, 0)
+
+    def test_large_empty_board_opens_without_recursion(self):
+        """沒有雷的大盤面一次打開全部格子；原本的版本在這裡超過遞迴深度上限"""
+        with mock.patch.dict(DIFFICULTY_MINE_PERCENT, {Difficulty.EASY: 0}):
+            block, reference = _pair(0, 200, 200, Difficulty.EASY)
+        indices = block.open_mine(100, 100)
+        self.assertEqual(len(indices), 200 * 200)
+        self.assertTrue((block.status == BlockStatus.opened).all())
+        with self.assertRaises(RecursionError):
+            reference.open_mine(100, 100)
+
+    def test_counts_match_neighbours(self):
+        """卷積算出的周圍雷數與逐格數八個鄰格的結果相同"""
+        for game in range(GAMES):
+            rng = random.Random(game)
+            width, height = rng.randint(1, MAX_SIDE), rng.randint(1, MAX_SIDE)
+            block, reference = _pair(game, width, height, rng.choice(list(Difficulty)))
+            expected = [[sum(reference.block[j][i].value for i, j in reference._get_around(x, y))
+                         for x in range(width)] for y in range(height)]
+            self.assertEqual(block.counts.tolist(), expected, game)
+
+    def test_counters_match_board_scan(self):
+        """
+        多局隨機打開、標記、雙擊，每一步之後已打開與標記的格子數、勝負要與掃描盤面的結果相同，
+        take_changed() 要涵蓋所有狀態有變的格子；最後把沒踩到雷的盤面解完，必須判定獲勝
+        """
+        won = 0
+        for game in range(GAMES):
+            rng = random.Random(game)
+            width, height = rng.randint(1, MAX_SIDE), rng.randint(1, MAX_SIDE)
+            block, reference = _pair(game, width, height, rng.choice(list(Difficulty)))
+            previous = block.status.copy()
+            for step in range(ACTIONS):
+                x, y = rng.randrange(width), rng.randrange(height)
+                status = reference.getmine(x, y).status
+                action = rng.random()
+                if action < 0.4:
+                    if status == BlockStatus.normal:
+                        block.open_mine(x, y)
+                        reference.open_mine(x, y)
+                elif action < 0.8:
+                    block.mark(x, y)
+                    reference.mark(x, y)
+                elif status == BlockStatus.opened:
+                    block.double_mouse_button_down(x, y)
+                    reference.double_mouse_button_down(x, y)
+                    if reference.getmine(x, y).status == BlockStatus.double:
+                        block.double_mouse_button_up(x, y)
+                        reference.double_mouse_button_up(x, y)
+                opened_count, flag_count = reference.scan()
+                self.assertEqual((block.opened_count, block.flag_count), (opened_count, flag_count), (game, step))
+                self.assertEqual(block.won, opened_count + flag_count == width * height, (game, step))
+                self.assertEqual(block.lost, bool((block.status == BlockStatus.bomb).any()), (game, step))
+                changed = block.take_changed()
+                self.assertEqual(len(changed), len(set(changed.tolist())))
+                self.assertLessEqual(set(np.flatnonzero(block.status != previous).tolist()), set(changed.tolist()),
+                                     (game, step))
+                previous = block.status.copy()
+            if block.lost:
+                continue
+            for y, x in np.argwhere(~block.mines):
+                while block.status[y, x] not in (BlockStatus.normal, BlockStatus.opened):
+                    block.mark(x, y)
+                block.open_mine(x, y)
+            for y, x in np.argwhere(block.mines):
+                while block.status[y, x] != BlockStatus.flag:
+                    block.mark(x, y)
+            self.assertTrue(block.won and not block.lost, game)
+            won += 1
+        self.assertGreater(won, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
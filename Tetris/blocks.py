@@ -3,7 +3,10 @@ from collections import namedtuple
 
 Point = namedtuple('Point', 'X Y')
 Shape = namedtuple('Shape', 'X Y Width Height')
-Block = namedtuple('Block', 'template start_pos end_pos name next')
+# masks 與 columns 在 import 時由 template 編成：
+#   masks    start_pos.Y 到 end_pos.Y 每一列的位元遮罩，位元 0 為 start_pos.X 那一欄，放到遊戲區第 x 欄時左移 x + start_pos.X 位
+#   columns  start_pos.X 到 end_pos.X 每一欄有方塊的列（由上而下），columns[j][-1] 即該欄的底部
+Block = namedtuple('Block', 'template start_pos end_pos name next masks columns', defaults=(None, None))
 
 # 方塊形狀設計說明：
 # 1. 使用 4×4 的矩陣來設計方塊，因為所有方塊的長寬最大都是4格
@@ -91,11 +94,32 @@ BLOCKS = {'O': O_BLOCK,
           'J': J_BLOCK}
 
 
-def get_block():
-    """隨機取得一個方塊"""
-    block_name = random.choice('OIZTLSJ')
+def _compile(block):
+    """把方塊樣板編成每列的位元遮罩與每欄的格子"""
+    masks = []
+    for row in block.template[block.start_pos.Y:block.end_pos.Y + 1]:
+        mask = 0
+        for j in range(block.start_pos.X, block.end_pos.X + 1):
+            if row[j] != '.':
+                mask |= 1 << (j - block.start_pos.X)
+        masks.append(mask)
+    columns = tuple(tuple(i for i, row in enumerate(block.template) if row[j] != '.')
+                    for j in range(block.start_pos.X, block.end_pos.X + 1))
+    return block._replace(masks=tuple(masks), columns=columns)
+
+
+for _rotations in BLOCKS.values():
+    _rotations[:] = [_compile(_block) for _block in _rotations]
+
+
+def get_block(rng=random):
+    """
+    隨機取得一個方塊
+    :param rng: 亂數來源，傳入 random.Random(seed) 可重現方塊順序
+    """
+    block_name = rng.choice('OIZTLSJ')
     b = BLOCKS[block_name]
-    idx = random.randint(0, len(b) - 1)
+    idx = rng.randint(0, len(b) - 1)
     return b[idx]
 
 
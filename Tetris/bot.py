@@ -0,0 +1,191 @@
+"""
+俄羅斯方塊電腦玩家：列出目前方塊與下一個方塊每種（旋轉, 欄）的落點，
+以 NumPy 一次算出所有組合落下後的盤面特徵（總高度、消除列數、洞數、凹凸度），取加權分數最高者。
+方塊都是從上方直直落下，落點由各欄最高的格子決定
+
+    python bot.py --games 20 --seed 1      無畫面連續玩幾局，回報每秒方塊數與平均每局消除列數
+"""
+
+import argparse
+import time
+from functools import lru_cache
+import numpy as np
+import blocks
+from engine import TetrisEngine, BLOCK_HEIGHT, BLOCK_WIDTH, LEFT, RIGHT, ROTATE, DROP
+
+# 特徵的權重：總高度、消除列數、洞數、凹凸度
+WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+MAX_PIECES = 5000   # 無畫面模式每局最多下幾個方塊，避免一局永遠玩不完
+
+_ABSENT = -1000     # 方塊在該欄沒有格子時的底部位移，使該欄不影響落點
+
+
+class Placements:
+    """一種方塊所有（旋轉, 欄）的落點資料"""
+
+    def __init__(self, name):
+        rotations, xs, tops, rows, cols, bottoms = [], [], [], [], [], []
+        for r, block in enumerate(blocks.BLOCKS[name]):
+            cells = [(i, j) for i, line in enumerate(block.template) for j, c in enumerate(line) if c != '.']
+            for x in range(-block.start_pos.X, BLOCK_WIDTH - block.end_pos.X):
+                bottom = [_ABSENT] * BLOCK_WIDTH
+                for i, j in cells:
+                    bottom[x + j] = max(bottom[x + j], i)
+                rotations.append(r)
+                xs.append(x)
+                tops.append(block.start_pos.Y)
+                rows.append([i for i, _ in cells])
+                cols.append([x + j for _, j in cells])
+                bottoms.append(bottom)
+        self.rotation = np.array(rotations)
+        self.x = np.array(xs)
+        self.top = np.array(tops)           # 方塊最上面一格在樣板中的列
+        self.rows = np.array(rows)          # (K, 4) 各格在樣板中的列
+        self.cols = np.array(cols)          # (K, 4) 各格在遊戲區的欄
+        self.bottom = np.array(bottoms)     # (K, 寬) 各欄最下面一格在樣板中的列
+
+    def __len__(self):
+        return len(self.x)
+
+
+@lru_cache(maxsize=None)
+def placements(name):
+    return Placements(name)
+
+
+def to_array(game_area):
+    """:return: (高, 寬) 的 bool 陣列"""
+    rows = np.array(game_area, dtype=np.int64)
+    return (rows[:, None] >> np.arange(BLOCK_WIDTH)) & 1 == 1
+
+
+def column_tops(boards):
+    """:return: (N, 寬) 各欄最上面有方塊的列，空欄為 BLOCK_HEIGHT"""
+    filled = boards.any(axis=1)
+    return np.where(filled, boards.argmax(axis=1), BLOCK_HEIGHT)
+
+
+def drop_all(boards, table, tops=None):
+    """
+    把 table 的每種落點分別放到每個盤面上並消除滿列
+    :param boards: (N, 高, 寬) bool
+    :param tops: (N, 寬) 各欄最上面有方塊的列，None 時由 boards 算出
+    :return: (新盤面 (N * K, 高, 寬), 消除列數 (N * K,), 是否未頂到上緣 (N * K,))，
+             第 n 個盤面的第 k 種落點在 n * K + k
+    """
+    n, k = len(boards), len(table)
+    if tops is None:
+        tops = column_tops(boards)
+    landing = (tops[:, None, :] - 1 - table.bottom[None, :, :]).min(axis=2)    # (N, K)
+    valid = (landing + table.top[None, :] > 0).ravel()
+    rows = np.maximum(landing[:, :, None] + table.rows[None, :, :], 0).reshape(n * k, -1)
+    cols = np.broadcast_to(table.cols, (n, k, table.cols.shape[1])).reshape(n * k, -1)
+    result = np.repeat(boards, k, axis=0)
+    result[np.arange(n * k)[:, None], rows, cols] = True
+
+    # 消除：只處理有滿列的盤面，滿列排到最上面再清空，其餘列保持順序
+    full = result.all(axis=2)
+    lines = full.sum(axis=1)
+    cleared = lines.nonzero()[0]
+    if len(cleared):
+        order = np.argsort(~full[cleared], axis=1, kind='stable')
+        moved = np.take_along_axis(result[cleared], order[:, :, None], axis=1)
+        moved[np.arange(BLOCK_HEIGHT)[None, :] < lines[cleared, None]] = False
+        result[cleared] = moved
+    return result, lines, valid
+
+
+def features(boards, cells):
+    """
+    :param cells: (N,) 各盤面的方塊格數
+    :return: (N, 3) 總高度、洞數、凹凸度
+    """
+    heights = BLOCK_HEIGHT - column_tops(boards)
+    total = heights.sum(axis=1)
+    holes = total - cells
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    return np.stack([total, holes, bumpiness], axis=1)
+
+
+class TetrisBot:
+    def __init__(self, weights=WEIGHTS, lookahead=True):
+        """
+        :param weights: 總高度、消除列數、洞數、凹凸度的權重
+        :param lookahead: 是否連同下一個方塊一起考慮
+        """
+        self.weights = weights
+        self.lookahead = lookahead
+
+    def best_placement(self, engine):
+        """
+        :return: (旋轉的索引, 欄, 分數)，每種落點都會頂到上緣時為 None
+        """
+        height, lines_weight, holes, bumpiness = self.weights
+        current = placements(engine.cur_block.name)
+        tops = BLOCK_HEIGHT - np.array(engine.heights)
+        boards, lines, valid = drop_all(to_array(engine.game_area)[None], current, tops[None])
+        pieces = 1
+        if self.lookahead:
+            after = placements(engine.next_block.name)
+            boards, next_lines, next_valid = drop_all(boards, after)
+            lines = np.repeat(lines, len(after)) + next_lines
+            valid = np.repeat(valid, len(after)) & next_valid
+            pieces = 2
+        # 每個方塊 4 格，每消除一列少 BLOCK_WIDTH 格
+        cells = engine.cells + 4 * pieces - BLOCK_WIDTH * lines
+        values = features(boards, cells) @ np.array([height, holes, bumpiness]) + lines_weight * lines
+        values = np.where(valid, values, -np.inf)
+        if self.lookahead:
+            values = values.reshape(len(current), -1).max(axis=1)
+        best = int(values.argmax())
+        if values[best] == -np.inf:
+            return None
+        return int(current.rotation[best]), int(current.x[best]), float(values[best])
+
+    def plan(self, engine):
+        """
+        :return: 把目前方塊移到最佳落點的操作（旋轉後左右移動），之後 DOWN 或 DROP 即可著陸
+        """
+        placement = self.best_placement(engine)
+        if placement is None:
+            return []
+        rotation, x, _ = placement
+        rotations = blocks.BLOCKS[engine.cur_block.name]
+        turns = (rotation - rotations.index(engine.cur_block)) % len(rotations)
+        dx = x - engine.cur_pos_x
+        return [ROTATE] * turns + [RIGHT if dx > 0 else LEFT] * abs(dx)
+
+    def play_piece(self, engine):
+        """無畫面時直接下完目前的方塊"""
+        for action in self.plan(engine):
+            engine.step(action)
+        engine.step(DROP)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='俄羅斯方塊電腦玩家（無畫面）')
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--max-pieces', type=int, default=MAX_PIECES, help='每局最多下幾個方塊')
+    parser.add_argument('--no-lookahead', action='store_true', help='只考慮目前的方塊')
+    args = parser.parse_args()
+
+    engine = TetrisEngine(args.seed)
+    bot = TetrisBot(lookahead=not args.no_lookahead)
+    total_pieces = total_lines = 0
+    started = time.perf_counter()
+    for game in range(1, args.games + 1):
+        engine.reset()
+        while not engine.game_over and engine.pieces < args.max_pieces:
+            bot.play_piece(engine)
+        total_pieces += engine.pieces
+        total_lines += engine.lines
+        print(f'第 {game} 局：{engine.pieces} 個方塊，消除 {engine.lines} 列，得分 {engine.score}'
+              f'{"" if engine.game_over else "（達到方塊上限）"}', flush=True)
+    elapsed = time.perf_counter() - started
+    print(f'共 {args.games} 局，{total_pieces} 個方塊，{total_pieces / elapsed:.0f} 個/秒，'
+          f'平均每局消除 {total_lines / args.games:.1f} 列')
+
+
+if __name__ == '__main__':
+    main()
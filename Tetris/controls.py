@@ -0,0 +1,82 @@
+"""
+俄羅斯方塊的鍵盤輸入：每個按鍵事件帶著時間（time.perf_counter，單調時鐘），
+按下時立即產生一次操作，按住左右鍵超過 DAS 秒後每 ARR 秒自動重複，按住下鍵每 SOFT_DROP 秒下落一格。
+poll(now) 一次取出到 now 為止所有該做的操作與各自的時間，由遊戲迴圈在同一幀內依序套用
+"""
+
+from collections import deque
+from engine import LEFT, RIGHT, DOWN
+
+DAS = 0.17          # 左右鍵按住多久後開始自動重複（delayed auto shift）
+ARR = 0.05          # 自動重複的間隔（auto repeat rate）
+SOFT_DROP = 0.05    # 按住下鍵時每隔幾秒下落一格
+LATENCY_SAMPLES = 120   # 延遲統計保留的最近樣本數
+
+_OPPOSITE = {LEFT: RIGHT, RIGHT: LEFT}
+
+
+class InputHandler:
+    def __init__(self, bindings, das=DAS, arr=ARR, soft_drop=SOFT_DROP):
+        """
+        :param bindings: {按鍵: 操作}
+        """
+        self.bindings = bindings
+        self._delays = {LEFT: (das, arr), RIGHT: (das, arr), DOWN: (soft_drop, soft_drop)}  # 操作 -> (首次重複, 間隔)
+        self._pressed = {}      # 按住的鍵 -> 操作
+        self._repeats = {}      # 會自動重複的操作 -> 下一次重複的時間
+        self._queue = []        # 尚未取出的 (時間, 操作)
+        self._pending = []      # 已取出、還沒畫到畫面上的輸入時間
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def press(self, key, t):
+        """:return: 是否為綁定的按鍵"""
+        action = self.bindings.get(key)
+        if action is None:
+            return False
+        if key in self._pressed:
+            return True
+        self._pressed[key] = action
+        self._queue.append((t, action))
+        if action in self._delays:
+            # 左右同時按住時以後按的為準
+            self._repeats.pop(_OPPOSITE.get(action), None)
+            self._repeats[action] = t + self._delays[action][0]
+        return True
+
+    def release(self, key, t):
+        action = self._pressed.pop(key, None)
+        if action is None or action in self._pressed.values():
+            return
+        self._repeats.pop(action, None)
+        opposite = _OPPOSITE.get(action)
+        if opposite in self._pressed.values() and opposite not in self._repeats:
+            # 放開後若另一方向仍按住，重新等 DAS 後繼續往那邊移
+            self._repeats[opposite] = t + self._delays[opposite][0]
+
+    def reset(self):
+        """放掉所有按鍵，例如開新局或暫停時"""
+        self._pressed.clear()
+        self._repeats.clear()
+        self._queue.clear()
+
+    def poll(self, now):
+        """
+        :return: 到 now 為止該做的 [(時間, 操作)]，依時間排序
+        """
+        events = self._queue
+        self._queue = []
+        for action, due in self._repeats.items():
+            interval = self._delays[action][1]
+            while due <= now:
+                events.append((due, action))
+                due += interval
+            self._repeats[action] = due
+        events.sort(key=lambda event: event[0])
+        self._pending.extend(t for t, _ in events)
+        return events
+
+    def presented(self, now):
+        """畫面更新後呼叫，記錄這一幀套用的輸入從發生到顯示的延遲"""
+        for t in self._pending:
+            self.latencies.append(now - t)
+        self._pending.clear()
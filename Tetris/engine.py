@@ -0,0 +1,214 @@
+"""
+俄羅斯方塊的規則核心，不依賴 pygame：給定亂數種子，以 step(action) 操作方塊、tick(dt) 推進時間。
+pygame 介面、電腦玩家與效能測試都透過它進行遊戲
+
+    engine = TetrisEngine(seed=1)
+    engine.step(LEFT)
+    engine.tick(1 / 60)
+
+遊戲時間 time 只由 tick 推進，與實際時間無關：同一個種子、在相同的 time 做相同的操作，結果必定相同
+"""
+
+import random
+import blocks
+
+BLOCK_HEIGHT = 25  # 遊戲區高度
+BLOCK_WIDTH = 10   # 遊戲區寬度
+FULL = (1 << BLOCK_WIDTH) - 1  # 填滿的一列；遊戲區每列以整數記錄，第 j 欄為位元 j
+ORIGINAL_SPEED = 0.5  # 開局時每隔幾秒自然下落一格
+MIN_SPEED = 0.02      # 每一萬分加速 0.03 秒，最快到此為止
+
+# 操作
+LEFT = 'left'
+RIGHT = 'right'
+ROTATE = 'rotate'
+DOWN = 'down'
+DROP = 'drop'
+ACTIONS = (LEFT, RIGHT, ROTATE, DOWN, DROP)    # 順序即重播檔中的操作代碼，只能往後加
+
+LINE_SCORES = {1: 100, 2: 300, 3: 700, 4: 1500}  # 一次消除幾列的得分
+
+
+class TetrisEngine:
+    def __init__(self, seed=None):
+        """
+        :param seed: 產生每局種子的亂數種子，None 為每次不同
+        """
+        self._seeds = random.Random(seed)
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        開新局
+        :param seed: 本局方塊順序的種子，None 時由引擎的亂數產生；記在 self.seed 供重播
+        """
+        self.seed = self._seeds.getrandbits(32) if seed is None else seed
+        self._random = random.Random(self.seed)
+        self.game_area = [0] * BLOCK_HEIGHT
+        # 隨著著陸與消除逐步更新的盤面統計
+        self.heights = [0] * BLOCK_WIDTH        # 各欄高度（最上面的格子到底部）
+        self.row_counts = [0] * BLOCK_HEIGHT    # 各列的格子數
+        self.cells = 0                          # 盤面上的格子數
+        self.holes = 0                          # 各欄最上面的格子之下的空格數
+        self.cur_block = blocks.get_block(self._random)
+        self.next_block = blocks.get_block(self._random)
+        self._spawn_position()
+        self.game_over = False
+        self.score = 0
+        self.speed = ORIGINAL_SPEED
+        self.lines = 0      # 本局消除的列數
+        self.pieces = 0     # 本局著陸的方塊數
+        self.time = 0.0     # 本局經過的遊戲時間（秒）
+        self._drop_due = self.speed     # 下一次自然下落的時間
+
+    def step(self, action):
+        """
+        :param action: LEFT、RIGHT、ROTATE、DOWN（下移一格，到底則著陸）或 DROP（直接落到底並著陸）
+        :return: 方塊是否有移動、旋轉或著陸
+        """
+        if self.game_over:
+            return False
+        block, x, y = self.cur_block, self.cur_pos_x, self.cur_pos_y
+        if action == ROTATE:
+            if 0 <= x <= BLOCK_WIDTH - len(block.template[0]):
+                next_block = blocks.get_next_block(block)
+                if self.can_move(x, y, next_block):
+                    self.cur_block = next_block
+                    return True
+        elif action == LEFT:
+            if x > -block.start_pos.X and self.can_move(x - 1, y, block):
+                self.cur_pos_x -= 1
+                return True
+        elif action == RIGHT:
+            if x + block.end_pos.X + 1 < BLOCK_WIDTH and self.can_move(x + 1, y, block):
+                self.cur_pos_x += 1
+                return True
+        elif action == DOWN:
+            if self._fall():
+                self._drop_due = self.time + self.speed
+            return True
+        elif action == DROP:
+            self.cur_pos_y = self.drop_position()
+            self._dock()
+            return True
+        else:
+            raise ValueError(f'未知的操作：{action}')
+        return False
+
+    def tick(self, dt):
+        """
+        經過 dt 秒，每隔 speed 秒方塊自然下落一格
+        :return: 這段時間內著陸的方塊數
+        """
+        return self.advance_to(self.time + dt)
+
+    def advance_to(self, time):
+        """
+        把遊戲時間推進到 time
+        :return: 這段時間內著陸的方塊數
+        """
+        docked = 0
+        self.time = time
+        while not self.game_over and time > self._drop_due:
+            if self._fall():
+                self._drop_due += self.speed
+            else:
+                docked += 1
+        return docked
+
+    def can_move(self, pos_x, pos_y, block):
+        """判斷方塊是否可以移動到指定位置"""
+        if pos_y + block.end_pos.Y >= BLOCK_HEIGHT:
+            return False
+        game_area = self.game_area
+        shift = pos_x + block.start_pos.X
+        for i, mask in enumerate(block.masks, block.start_pos.Y):
+            if pos_y + i >= 0 and game_area[pos_y + i] & (mask << shift):
+                return False
+        return True
+
+    def drop_position(self):
+        """
+        :return: 目前方塊直接落到底時的 cur_pos_y（也是幽靈方塊的位置）
+        """
+        block, heights = self.cur_block, self.heights
+        x = self.cur_pos_x + block.start_pos.X
+        pos_y = BLOCK_HEIGHT
+        for j, rows in enumerate(block.columns):
+            pos_y = min(pos_y, BLOCK_HEIGHT - heights[x + j] - 1 - rows[-1])
+        if pos_y >= self.cur_pos_y:
+            return pos_y
+        # 方塊已在某欄最上面的格子之下（移進懸空處的下方），只能逐格往下找
+        pos_y = self.cur_pos_y
+        while self.can_move(self.cur_pos_x, pos_y + 1, block):
+            pos_y += 1
+        return pos_y
+
+    def features(self):
+        """:return: (總高度, 洞數, 凹凸度)"""
+        heights = self.heights
+        return sum(heights), self.holes, sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+
+    def _fall(self):
+        """
+        下移一格，不能再下移時著陸
+        :return: 是否有下移
+        """
+        if self.can_move(self.cur_pos_x, self.cur_pos_y + 1, self.cur_block):
+            self.cur_pos_y += 1
+            return True
+        self._dock()
+        return False
+
+    def _dock(self):
+        """處理方塊著陸"""
+        block, pos_y = self.cur_block, self.cur_pos_y
+        game_area, row_counts, heights = self.game_area, self.row_counts, self.heights
+        shift = self.cur_pos_x + block.start_pos.X
+        for i, mask in enumerate(block.masks, block.start_pos.Y):
+            if pos_y + i >= 0:
+                game_area[pos_y + i] |= mask << shift
+        for j, rows in enumerate(block.columns):
+            rows = [pos_y + i for i in rows if pos_y + i >= 0]
+            if not rows:
+                continue
+            for row in rows:
+                row_counts[row] += 1
+            # 新的高度與原高度之間、以及原本在最上面的格子之下被填上的，都算進洞數的增減
+            column = shift + j
+            height = max(heights[column], BLOCK_HEIGHT - rows[0])
+            self.holes += height - heights[column] - len(rows)
+            self.cells += len(rows)
+            heights[column] = height
+        self.pieces += 1
+        if pos_y + block.start_pos.Y <= 0:
+            self.game_over = True
+            return
+        # 計算消除
+        remove_count = 0
+        for i in range(block.start_pos.Y, block.end_pos.Y + 1):
+            if row_counts[pos_y + i] == BLOCK_WIDTH:
+                remove_count += 1
+        if remove_count:
+            self.score += LINE_SCORES[remove_count]
+            self.lines += remove_count
+            self.speed = max(ORIGINAL_SPEED - 0.03 * (self.score // 10000), MIN_SPEED)
+            # 消除：去掉滿的列，上方補上空列
+            game_area[:] = [0] * remove_count + [row for row in game_area if row != FULL]
+            row_counts[:] = [0] * remove_count + [count for count in row_counts if count != BLOCK_WIDTH]
+            self.cells -= remove_count * BLOCK_WIDTH
+            # 各欄原本最上面的格子以上在消除後仍是空的，從那裡往下找新的最上面的格子
+            for column in range(BLOCK_WIDTH):
+                if heights[column]:
+                    row, bit = BLOCK_HEIGHT - heights[column], 1 << column
+                    while row < BLOCK_HEIGHT and not game_area[row] & bit:
+                        row += 1
+                    heights[column] = BLOCK_HEIGHT - row
+            self.holes = sum(heights) - self.cells
+        self.cur_block = self.next_block
+        self.next_block = blocks.get_block(self._random)
+        self._spawn_position()
+
+    def _spawn_position(self):
+        self.cur_pos_x = (BLOCK_WIDTH - self.cur_block.end_pos.X - 1) // 2
+        self.cur_pos_y = -1 - self.cur_block.end_pos.Y
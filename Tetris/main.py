@@ -1,14 +1,18 @@
-﻿import sys
+﻿import argparse
+import sys
 import time
 import pygame
 from pygame.locals import *
-import blocks
+from engine import TetrisEngine, BLOCK_HEIGHT, BLOCK_WIDTH, LEFT, RIGHT, ROTATE, DOWN, DROP
+from bot import TetrisBot
+from replay import Recorder, Replay
+from controls import InputHandler, DAS, ARR
 
 # 遊戲區域設定
 SIZE = 30  # 每個小方格大小
-BLOCK_HEIGHT = 25  # 遊戲區高度
-BLOCK_WIDTH = 10   # 遊戲區寬度
 BORDER_WIDTH = 4   # 遊戲區邊框寬度
+BOT_INTERVAL = 0.05  # 電腦代玩時每隔幾秒操作一次
+GHOST_WIDTH = 2      # 幽靈方塊（落點提示）的外框寬度
 
 # 顏色定義
 BORDER_COLOR = (40, 40, 200)  # 遊戲區邊框顏色
@@ -45,6 +49,15 @@ def print_text(screen, font, x, y, text, fcolor=WHITE):
     except pygame.error:
         pass  # 忽略字體渲染錯誤
 
+def save_replay(recorder, engine):
+    """存下一局的重播，寫入失敗時略過"""
+    try:
+        path = recorder.save(engine)
+    except OSError as e:
+        print(f'無法儲存重播：{e}')
+        return
+    print(f'重播已存到 {path}')
+
 class Button:
     """按鈕類"""
     def __init__(self, screen, text, x, y, width, height, color, hover_color, font):
@@ -81,7 +94,13 @@ class Button:
                 return True
         return False
 
-def main():
+def main(replay=None, fast=False, das=DAS, arr=ARR):
+    """
+    :param replay: 重播檔路徑，給定時播放記錄而不接受操作
+    :param fast: 重播時直接跳到結尾，不繪製中間的畫面
+    :param das: 左右鍵按住多久後開始自動重複（秒）
+    :param arr: 自動重複的間隔（秒）
+    """
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption('俄羅斯方塊')
@@ -118,75 +137,35 @@ def main():
     }
 
     # 初始化遊戲變數
-    global cur_block, next_block, game_area, cur_pos_x, cur_pos_y, game_over, score, speed, orispeed, last_drop_time, last_press_time, pause, start
-    
-    # Initialize the game variables
-    cur_block = blocks.get_block()
-    next_block = blocks.get_block()
-    game_area = [['.'] * BLOCK_WIDTH for _ in range(BLOCK_HEIGHT)]
-    cur_pos_x = (BLOCK_WIDTH - cur_block.end_pos.X - 1) // 2
-    cur_pos_y = -1 - cur_block.end_pos.Y
-    game_over = True  # Start with game over state
-    score = 0
-    orispeed = 0.5
-    speed = orispeed
-    last_drop_time = time.time()
-    last_press_time = time.time()
+    engine = TetrisEngine()
+    engine.game_over = True  # Start with game over state
+    last_tick_time = time.perf_counter()
     pause = False
     start = False
+    bot = TetrisBot()
+    autoplay = False
+    bot_actions = []
+    bot_piece = None    # 已規劃好操作的方塊（engine.pieces）
+    last_bot_time = time.perf_counter()
+    recorder = None     # 本局的操作記錄，局結束時存檔
+    playback = Replay.load(replay) if replay else None
+    replay_index = 0    # 下一個要重播的操作
 
-    def _dock():
-        """處理方塊著陸"""
-        global cur_block, next_block, game_area, cur_pos_x, cur_pos_y, game_over, score, speed
-        for _i in range(cur_block.start_pos.Y, cur_block.end_pos.Y + 1):
-            for _j in range(cur_block.start_pos.X, cur_block.end_pos.X + 1):
-                if cur_block.template[_i][_j] != '.':
-                    game_area[cur_pos_y + _i][cur_pos_x + _j] = '0'
-        if cur_pos_y + cur_block.start_pos.Y <= 0:
-            game_over = True
-        else:
-            # 計算消除
-            remove_idxs = []
-            for _i in range(cur_block.start_pos.Y, cur_block.end_pos.Y + 1):
-                if all(_x == '0' for _x in game_area[cur_pos_y + _i]):
-                    remove_idxs.append(cur_pos_y + _i)
-            if remove_idxs:
-                # 計算得分
-                remove_count = len(remove_idxs)
-                if remove_count == 1:
-                    score += 100
-                elif remove_count == 2:
-                    score += 300
-                elif remove_count == 3:
-                    score += 700
-                elif remove_count == 4:
-                    score += 1500
-                speed = orispeed - 0.03 * (score // 10000)
-                # 消除
-                _i = _j = remove_idxs[-1]
-                while _i >= 0:
-                    while _j in remove_idxs:
-                        _j -= 1
-                    if _j < 0:
-                        game_area[_i] = ['.'] * BLOCK_WIDTH
-                    else:
-                        game_area[_i] = game_area[_j]
-                    _i -= 1
-                    _j -= 1
-            cur_block = next_block
-            next_block = blocks.get_block()
-            cur_pos_x, cur_pos_y = (BLOCK_WIDTH - cur_block.end_pos.X - 1) // 2, -1 - cur_block.end_pos.Y
-
-    def _judge(pos_x, pos_y, block):
-        """判斷方塊是否可以移動到指定位置"""
-        global game_area
-        for _i in range(block.start_pos.Y, block.end_pos.Y + 1):
-            if pos_y + block.end_pos.Y >= BLOCK_HEIGHT:
-                return False
-            for _j in range(block.start_pos.X, block.end_pos.X + 1):
-                if pos_y + _i >= 0 and block.template[_i][_j] != '.' and game_area[pos_y + _i][pos_x + _j] != '.':
-                    return False
-        return True
+    def _start_replay():
+        """從頭重播，fast 時直接算到結尾"""
+        nonlocal engine, replay_index
+        engine = playback.start()
+        replay_index = playback.play(engine, playback.end_time) if fast else 0
+
+    if playback is not None:
+        start = True
+        _start_replay()
+
+    def _act(action):
+        """操作方塊並記錄到重播"""
+        engine.step(action)
+        if recorder is not None:
+            recorder.record(engine.time, action)
 
     def _draw_background(screen):
         """繪製背景"""
@@ -210,20 +189,20 @@ def main():
         """繪製遊戲區域"""
         if game_area:
             for i, row in enumerate(game_area):
-                for j, cell in enumerate(row):
-                    if cell != '.':
+                for j in range(BLOCK_WIDTH):
+                    if row >> j & 1:
                         pygame.draw.rect(screen, BLOCK_COLOR, (j * SIZE, i * SIZE, SIZE, SIZE), 0)
 
-    def _draw_block(screen, block, offset_x, offset_y, pos_x, pos_y):
-        """繪製方塊"""
+    def _draw_block(screen, block, offset_x, offset_y, pos_x, pos_y, width=0):
+        """繪製方塊，width 大於 0 時只畫外框"""
         if block:
             for i in range(block.start_pos.Y, block.end_pos.Y + 1):
                 for j in range(block.start_pos.X, block.end_pos.X + 1):
                     if block.template[i][j] != '.':
                         pygame.draw.rect(screen, BLOCK_COLOR,
-                                         (offset_x + (pos_x + j) * SIZE, offset_y + (pos_y + i) * SIZE, SIZE, SIZE), 0)
+                                         (offset_x + (pos_x + j) * SIZE, offset_y + (pos_y + i) * SIZE, SIZE, SIZE), width)
 
-    def _draw_info(screen, font, pos_x, font_height, score):
+    def _draw_info(screen, font, pos_x, font_height, score, autoplay, replaying):
         """繪製遊戲資訊"""
         info_y = 10
         line_spacing = font_height + 10
@@ -232,7 +211,12 @@ def main():
         print_text(screen, font, pos_x, info_y, f'得分：{score}')
         info_y += line_spacing
         print_text(screen, font, pos_x, info_y, f'速度：{score//10000}')
-        info_y += line_spacing * 2
+        info_y += line_spacing
+        if replaying:
+            print_text(screen, font, pos_x, info_y, '重播中')
+        else:
+            print_text(screen, font, pos_x, info_y, f'A : 電腦代玩（{"開" if autoplay else "關"}）')
+        info_y += line_spacing
         
         # 下一個方塊提示
         print_text(screen, font, pos_x, info_y, '下一個方塊：')
@@ -245,94 +229,114 @@ def main():
         info_y += line_spacing
         print_text(screen, font, pos_x, info_y, '← → : 左右移動')
         info_y += line_spacing
-        print_text(screen, font, pos_x, info_y, '↓ : 加速下落')
+        print_text(screen, font, pos_x, info_y, '↓ : 加速下落　S : 到底')
         info_y += line_spacing
         print_text(screen, font, pos_x, info_y, 'Space : 暫停')
         info_y += line_spacing
         print_text(screen, font, pos_x, info_y, 'Enter : 開始')
 
+    def _draw_debug(screen, font, latencies, frame_time):
+        """繪製除錯資訊：輸入到畫面的延遲與每幀時間"""
+        if latencies:
+            print_text(screen, font, 5, 5, f'輸入延遲 {latencies[-1] * 1000:.1f} ms（平均 '
+                       f'{sum(latencies) / len(latencies) * 1000:.1f}，最大 {max(latencies) * 1000:.1f}）')
+        else:
+            print_text(screen, font, 5, 5, '輸入延遲 -')
+        print_text(screen, font, 5, 30, f'每幀 {frame_time * 1000:.1f} ms')
+
+    keys = {pygame.K_UP: ROTATE, pygame.K_w: ROTATE, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT,
+            pygame.K_DOWN: DOWN, pygame.K_s: DROP}
+    controls = InputHandler(keys, das, arr)
+    show_debug = False
+    frame_time = 0.0
+
     while True:
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        now = time.perf_counter()  # pygame 的事件不帶時間，以取出的時間為準
+        for event in events:
             if event.type == QUIT:
+                if recorder is not None:
+                    save_replay(recorder, engine)
                 sys.exit()
             
             # 處理按鈕事件
             if buttons['start'].handle_event(event):
-                if game_over:
+                if playback is not None:
+                    _start_replay()
+                elif engine.game_over:
                     start = True
-                    game_over = False
-                    score = 0
-                    speed = orispeed
-                    last_drop_time = time.time()
-                    last_press_time = time.time()
-                    game_area = [['.'] * BLOCK_WIDTH for _ in range(BLOCK_HEIGHT)]
-                    cur_block = blocks.get_block()
-                    next_block = blocks.get_block()
-                    cur_pos_x, cur_pos_y = (BLOCK_WIDTH - cur_block.end_pos.X - 1) // 2, -1 - cur_block.end_pos.Y
+                    engine.reset()
+                    recorder = Recorder(engine.seed)
+                    bot_piece = None
+                    controls.reset()
             
-            if not game_over:
+            if not engine.game_over:
                 if buttons['pause'].handle_event(event):
                     pause = not pause
+                    controls.reset()
 
             if event.type == pygame.KEYDOWN:
-                if not game_over:
+                if event.key == pygame.K_F3:
+                    show_debug = not show_debug
+
+                elif not engine.game_over:
                     if event.key == pygame.K_SPACE:
                         pause = not pause
+                        controls.reset()
                     
-                    if not pause:
-                        if event.key in (pygame.K_UP, pygame.K_w):
-                            if time.time() - last_press_time > 0.1:
-                                last_press_time = time.time()
-                                if 0 <= cur_pos_x <= BLOCK_WIDTH - len(cur_block.template[0]):
-                                    _next_block = blocks.get_next_block(cur_block)
-                                    if _judge(cur_pos_x, cur_pos_y, _next_block):
-                                        cur_block = _next_block
-                        
-                        elif event.key == pygame.K_LEFT:
-                            if time.time() - last_press_time > 0.1:
-                                last_press_time = time.time()
-                                if cur_pos_x > - cur_block.start_pos.X:
-                                    if _judge(cur_pos_x - 1, cur_pos_y, cur_block):
-                                        cur_pos_x -= 1
-                        
-                        elif event.key == pygame.K_RIGHT:
-                            if time.time() - last_press_time > 0.1:
-                                last_press_time = time.time()
-                                if cur_pos_x + cur_block.end_pos.X + 1 < BLOCK_WIDTH:
-                                    if _judge(cur_pos_x + 1, cur_pos_y, cur_block):
-                                        cur_pos_x += 1
-                        
-                        elif event.key == pygame.K_DOWN:
-                            if time.time() - last_press_time > 0.1:
-                                last_press_time = time.time()
-                                if not _judge(cur_pos_x, cur_pos_y + 1, cur_block):
-                                    _dock()
-                                else:
-                                    last_drop_time = time.time()
-                                    cur_pos_y += 1
+                    elif playback is not None:
+                        pass    # 重播時只能暫停
+
+                    elif event.key == pygame.K_a:
+                        autoplay = not autoplay
+                        bot_piece = None
+                        controls.reset()
+
+                    elif not pause and not autoplay:
+                        controls.press(event.key, now)
+
+            elif event.type == pygame.KEYUP:
+                controls.release(event.key, now)
+
+        # 更新遊戲：本幀取出的所有操作依各自的時間穿插在自然下落之間套用
+        if not engine.game_over and not pause:
+            if playback is not None:
+                replay_index = playback.play(engine, engine.time + now - last_tick_time, replay_index)
+            else:
+                for t, action in controls.poll(now):
+                    if t > last_tick_time:
+                        engine.tick(t - last_tick_time)
+                        last_tick_time = t
+                    _act(action)
+                engine.tick(now - last_tick_time)
+                if autoplay and now - last_bot_time > BOT_INTERVAL:
+                    # 每個新方塊規劃一次，先旋轉、左右移動，再加速下落
+                    last_bot_time = now
+                    if bot_piece != engine.pieces:
+                        bot_piece = engine.pieces
+                        bot_actions = bot.plan(engine)
+                    _act(bot_actions.pop(0) if bot_actions else DOWN)
+        last_tick_time = now
+        if recorder is not None and engine.game_over:
+            save_replay(recorder, engine)
+            recorder = None
 
         _draw_background(screen)
 
-        _draw_game_area(screen, game_area)
+        _draw_game_area(screen, engine.game_area)
 
         _draw_gridlines(screen)
 
-        if not game_over:
+        if not engine.game_over:
             if pause:
                 # Draw pause text in the center of the game area
                 pause_text = font2.render("PAUSE", True, WHITE)
                 text_rect = pause_text.get_rect(center=(BLOCK_WIDTH * SIZE // 2, SCREEN_HEIGHT // 2))
                 screen.blit(pause_text, text_rect)
             else:
-                # Draw current block and handle dropping
-                _draw_block(screen, cur_block, 0, 0, cur_pos_x, cur_pos_y)
-                cur_drop_time = time.time()
-                if cur_drop_time - last_drop_time > speed:
-                    if not _judge(cur_pos_x, cur_pos_y + 1, cur_block):
-                        _dock()
-                    else:
-                        last_drop_time = cur_drop_time
-                        cur_pos_y += 1
+                # Draw ghost piece and current block
+                _draw_block(screen, engine.cur_block, 0, 0, engine.cur_pos_x, engine.drop_position(), GHOST_WIDTH)
+                _draw_block(screen, engine.cur_block, 0, 0, engine.cur_pos_x, engine.cur_pos_y)
         else:
             if start:
                 print_text(screen, font2,
@@ -341,14 +345,27 @@ def main():
                           'GAME OVER', RED)
 
         # Always draw score and next block
-        _draw_info(screen, font1, info_area_x, font1.size('得分')[1], score)
-        _draw_block(screen, next_block, info_area_x, 30 + (font1.size('得分')[1] + 6) * 5, 0, 0)
+        _draw_info(screen, font1, info_area_x, font1.size('得分')[1], engine.score, autoplay,
+                   playback is not None)
+        _draw_block(screen, engine.next_block, info_area_x, 30 + (font1.size('得分')[1] + 6) * 5, 0, 0)
 
         # Draw buttons
         for button in buttons.values():
             button.draw()
 
+        if show_debug:
+            _draw_debug(screen, button_font, controls.latencies, frame_time)
+
         pygame.display.flip()
+        presented = time.perf_counter()
+        controls.presented(presented)
+        frame_time = presented - now
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='俄羅斯方塊')
+    parser.add_argument('--replay', default=None, help='播放重播檔')
+    parser.add_argument('--fast', action='store_true', help='重播時直接跳到結尾')
+    parser.add_argument('--das', type=float, default=DAS, help='左右鍵按住多久後開始自動重複（秒）')
+    parser.add_argument('--arr', type=float, default=ARR, help='自動重複的間隔（秒）')
+    args = parser.parse_args()
+    main(args.replay, args.fast, args.das, args.arr)
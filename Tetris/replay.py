@@ -0,0 +1,139 @@
+"""
+俄羅斯方塊重播：記下每局的種子與每個操作發生時的遊戲時間（TetrisEngine.time），
+之後以同一個種子在相同的時間做相同的操作即可原樣重現整局
+
+    python replay.py replays/20250101-120000.ttr          以最快速度重播（不繪圖），核對結果並回報耗時
+    python main.py --replay replays/20250101-120000.ttr   在遊戲畫面以原速重播，加 --fast 直接跳到結尾
+
+檔案格式（little-endian）：
+    檔頭    'TTRP'、版本 (B)、種子 (Q)
+    操作    遊戲時間 (d)、操作代碼 (B)，代碼為 engine.ACTIONS 的索引，每個操作 9 位元組
+    結尾    遊戲時間 (d)、END，之後是最後的得分、消除列數、方塊數 (III)
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from engine import TetrisEngine, ACTIONS
+
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replays')
+MAGIC = b'TTRP'
+VERSION = 1
+END = 255
+
+_HEADER = struct.Struct('<4sBQ')
+_EVENT = struct.Struct('<dB')
+_RESULT = struct.Struct('<III')
+_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class Recorder:
+    """記錄一局的操作"""
+
+    def __init__(self, seed):
+        """
+        :param seed: 本局的種子（TetrisEngine.seed）
+        """
+        self.seed = seed
+        self._events = bytearray()
+
+    def record(self, time, action):
+        """:param time: 操作時的 TetrisEngine.time"""
+        self._events += _EVENT.pack(time, _CODES[action])
+
+    def save(self, engine, path=None):
+        """
+        在一局結束（或中途離開）時存檔
+        :param path: None 時以目前時間命名存在 REPLAY_DIR
+        :return: 檔案路徑
+        """
+        if path is None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, time.strftime('%Y%m%d-%H%M%S') + '.ttr')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.seed))
+            f.write(self._events)
+            f.write(_EVENT.pack(engine.time, END))
+            f.write(_RESULT.pack(engine.score, engine.lines, engine.pieces))
+        return path
+
+
+class Replay:
+    def __init__(self, seed, events, end_time, result):
+        self.seed = seed
+        self.events = events        # [(遊戲時間, 操作)]
+        self.end_time = end_time
+        self.result = result        # 記錄時最後的 (得分, 消除列數, 方塊數)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _HEADER.size or data[:4] != MAGIC:
+            raise ValueError(f'{path} 不是俄羅斯方塊的重播檔')
+        _, version, seed = _HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f'不支援的重播檔版本 {version}')
+        events = []
+        for offset in range(_HEADER.size, len(data) - _EVENT.size + 1, _EVENT.size):
+            t, code = _EVENT.unpack_from(data, offset)
+            if code == END:
+                result = _RESULT.unpack_from(data, offset + _EVENT.size)
+                return cls(seed, events, t, result)
+            if code >= len(ACTIONS):
+                raise ValueError(f'無法辨識的操作代碼 {code}')
+            events.append((t, ACTIONS[code]))
+        raise ValueError(f'{path} 不完整（沒有結尾）')
+
+    def start(self):
+        """:return: 以本局種子開局的 TetrisEngine"""
+        engine = TetrisEngine()
+        engine.reset(self.seed)
+        return engine
+
+    def play(self, engine, until, index=0):
+        """
+        把 engine 重播到遊戲時間 until
+        :param index: 從第幾個操作繼續
+        :return: 下一個尚未重播的操作索引
+        """
+        events = self.events
+        while index < len(events) and events[index][0] <= until:
+            t, action = events[index]
+            engine.advance_to(t)
+            engine.step(action)
+            index += 1
+        engine.advance_to(min(until, self.end_time))
+        return index
+
+    def run(self):
+        """:return: 以最快速度重播到結尾的 TetrisEngine"""
+        engine = self.start()
+        self.play(engine, self.end_time)
+        return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description='俄羅斯方塊重播（不繪圖）')
+    parser.add_argument('replays', nargs='+', help='重播檔')
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.replays:
+        replay = Replay.load(path)
+        started = time.perf_counter()
+        engine = replay.run()
+        elapsed = time.perf_counter() - started
+        result = (engine.score, engine.lines, engine.pieces)
+        ok = result == replay.result
+        failed += not ok
+        print(f'{path}：{len(replay.events)} 個操作，遊戲時間 {replay.end_time:.1f} 秒，重播 {elapsed * 1000:.1f} ms，'
+              f'得分 {engine.score}、消除 {engine.lines} 列、{engine.pieces} 個方塊'
+              f'{"" if ok else f"（與記錄的 {replay.result} 不符）"}')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+以位元遮罩記錄的遊戲區（engine.TetrisEngine）與原本以字串記錄的遊戲區逐步比對：
+碰撞判斷、著陸與消除的結果必須相同
+
+    python -m unittest test_bitboard        （在 Tetris 目錄下）
+    python -m pytest Tetris/test_bitboard.py
+"""
+
+import random
+import unittest
+import blocks
+from bot import TetrisBot
+from engine import TetrisEngine, BLOCK_HEIGHT, BLOCK_WIDTH, LINE_SCORES, LEFT, RIGHT, ROTATE, DOWN
+
+GAMES = 100
+MAX_STEPS = 3000
+
+
+class StringBoard:
+    """原本的遊戲區：每列是 '.'（空）或 '0'（有方塊）組成的 list，碰撞與消除照舊逐格處理"""
+
+    def __init__(self):
+        self.area = [['.'] * BLOCK_WIDTH for _ in range(BLOCK_HEIGHT)]
+
+    def judge(self, pos_x, pos_y, block):
+        """判斷方塊是否可以移動到指定位置"""
+        for i in range(block.start_pos.Y, block.end_pos.Y + 1):
+            if pos_y + block.end_pos.Y >= BLOCK_HEIGHT:
+                return False
+            for j in range(block.start_pos.X, block.end_pos.X + 1):
+                if pos_y + i >= 0 and block.template[i][j] != '.' and self.area[pos_y + i][pos_x + j] != '.':
+                    return False
+        return True
+
+    def dock(self, pos_x, pos_y, block, wrap=True):
+        """
+        著陸並消除滿列
+        :param wrap: 照原本的寫法，遊戲區上方的格子經由負索引寫到最下面幾列
+        :return: (是否結束, 得分)
+        """
+        for i in range(block.start_pos.Y, block.end_pos.Y + 1):
+            for j in range(block.start_pos.X, block.end_pos.X + 1):
+                if block.template[i][j] != '.' and (wrap or pos_y + i >= 0):
+                    self.area[pos_y + i][pos_x + j] = '0'
+        if pos_y + block.start_pos.Y <= 0:
+            return True, 0
+        remove_idxs = [pos_y + i for i in range(block.start_pos.Y, block.end_pos.Y + 1)
+                       if all(c == '0' for c in self.area[pos_y + i])]
+        if not remove_idxs:
+            return False, 0
+        i = j = remove_idxs[-1]
+        while i >= 0:
+            while j in remove_idxs:
+                j -= 1
+            self.area[i] = ['.'] * BLOCK_WIDTH if j < 0 else self.area[j]
+            i -= 1
+            j -= 1
+        return False, LINE_SCORES[len(remove_idxs)]
+
+    def rows(self):
+        """:return: 與 TetrisEngine.game_area 相同的位元遮罩表示"""
+        return [sum(1 << j for j, c in enumerate(row) if c != '.') for row in self.area]
+
+    def copy(self):
+        board = StringBoard()
+        board.area = [list(row) for row in self.area]
+        return board
+
+
+def _random_area(rng):
+    """:return: 下半部隨機填了格子的字串遊戲區"""
+    board = StringBoard()
+    for row in board.area[rng.randrange(BLOCK_HEIGHT):]:
+        for j in range(BLOCK_WIDTH):
+            if rng.random() < 0.5:
+                row[j] = '0'
+    return board
+
+
+class BitBoardTest(unittest.TestCase):
+    def test_can_move_matches_string_board(self):
+        rng = random.Random(0)
+        engine = TetrisEngine(0)
+        all_blocks = [block for rotations in blocks.BLOCKS.values() for block in rotations]
+        for _ in range(300):
+            board = _random_area(rng)
+            engine.game_area = board.rows()
+            for block in all_blocks:
+                for pos_x in range(-block.start_pos.X, BLOCK_WIDTH - block.end_pos.X):
+                    for pos_y in range(-block.end_pos.Y - 1, BLOCK_HEIGHT - block.start_pos.Y):
+                        self.assertEqual(engine.can_move(pos_x, pos_y, block), board.judge(pos_x, pos_y, block),
+                                         (block.name, pos_x, pos_y))
+
+    def test_games_match_string_board(self):
+        """
+        多局逐步比對遊戲區、方塊位置與得分；頂到上緣那一次著陸依新的寫法不經由負索引寫入。
+        一半的局由電腦玩家決定每個方塊的落點（會消除許多列），另一半完全隨機操作
+        """
+        bot = TetrisBot(lookahead=False)
+        total_lines = 0
+        for game in range(GAMES):
+            engine = TetrisEngine()
+            engine.reset(game)
+            board, score = StringBoard(), 0
+            actions = random.Random(game + 1000)
+            planned, pieces = [], -1
+            for _ in range(MAX_STEPS):
+                block, x, y = engine.cur_block, engine.cur_pos_x, engine.cur_pos_y
+                if game % 2 and engine.pieces != pieces:
+                    planned, pieces = bot.plan(engine), engine.pieces
+                if planned:
+                    action = planned.pop(0)
+                elif game % 2:
+                    action = DOWN
+                else:
+                    action = actions.choice((LEFT, RIGHT, ROTATE, DOWN, DOWN, DOWN))
+                if action == ROTATE:
+                    if 0 <= x <= BLOCK_WIDTH - len(block.template[0]):
+                        next_block = blocks.get_next_block(block)
+                        if board.judge(x, y, next_block):
+                            block = next_block
+                elif action == LEFT:
+                    if x > -block.start_pos.X and board.judge(x - 1, y, block):
+                        x -= 1
+                elif action == RIGHT:
+                    if x + block.end_pos.X + 1 < BLOCK_WIDTH and board.judge(x + 1, y, block):
+                        x += 1
+                elif board.judge(x, y + 1, block):
+                    y += 1
+                else:
+                    game_over, gained = board.dock(x, y, block, wrap=False)
+                    score += gained
+                    engine.step(action)
+                    self.assertEqual(engine.game_over, game_over, (game, engine.pieces))
+                    self.assertEqual(engine.game_area, board.rows(), (game, engine.pieces))
+                    self.assertEqual(engine.score, score, (game, engine.pieces))
+                    if game_over:
+                        break
+                    continue
+                engine.step(action)
+                self.assertEqual((engine.cur_block, engine.cur_pos_x, engine.cur_pos_y), (block, x, y),
+                                 (game, engine.pieces))
+            total_lines += engine.lines
+        self.assertGreater(total_lines, 0)  # 確實比對到了消除
+
+    def test_dock_above_top_does_not_wrap(self):
+        """刻意的差異：頂到上緣時，遊戲區以上的格子不再經由負索引寫到最下面幾列"""
+        block = blocks.BLOCKS['I'][0]   # 直立的 I
+        engine = TetrisEngine(0)
+        engine.reset(0)
+        board = StringBoard()
+        board.area[2][0] = '0'      # 懸在第 2 列的一格擋住 I，最下面幾列的第 0 欄是空的
+        engine.game_area = board.rows()
+        engine.heights[0] = BLOCK_HEIGHT - 2
+        engine.row_counts[2] = 1
+        engine.cells = 1
+        engine.holes = BLOCK_HEIGHT - 3
+        engine.cur_block, engine.cur_pos_x, engine.cur_pos_y = block, -block.start_pos.X, -2
+
+        self.assertFalse(engine.can_move(engine.cur_pos_x, engine.cur_pos_y + 1, block))
+        engine.step(DOWN)
+
+        wrapped = board.copy()
+        self.assertEqual(wrapped.dock(engine.cur_pos_x, -2, block, wrap=True), (True, 0))
+        skipped = board.copy()
+        skipped.dock(engine.cur_pos_x, -2, block, wrap=False)
+        self.assertTrue(engine.game_over)
+        self.assertEqual(engine.game_area, skipped.rows())
+        self.assertEqual(engine.game_area[2:], board.rows()[2:])   # 最下面幾列沒有被寫到
+        self.assertNotEqual(engine.game_area, wrapped.rows())
+
+
+if __name__ == '__main__':
+    unittest.main()